@@ -0,0 +1 @@
+"""Benchmarks and a synthetic corpus generator for the site generator."""
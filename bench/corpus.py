@@ -0,0 +1,202 @@
+import os
+import random
+
+
+WORDS = (
+    "elf ring shire hobbit wizard river mountain forest tower ranger king road "
+    "lantern song sword shadow harbour valley star council dragon ale pipe "
+    "map journey fellowship riddle gate bridge mithril banner horn"
+).split()
+
+# Relative weights of block kinds and density of inline markup per profile
+PROFILES = {
+    "default": {
+        "blocks": {"heading": 2, "paragraph": 6, "unordered_list": 2, "ordered_list": 1,
+                   "quote": 1, "code": 1, "image": 1},
+        "inline_density": 0.15,
+        "link_density": 0.05,
+        "paragraph_words": (40, 120),
+        "list_items": (3, 8),
+    },
+    "dense-inline": {
+        "blocks": {"heading": 1, "paragraph": 10},
+        "inline_density": 0.6,
+        "link_density": 0.1,
+        "paragraph_words": (150, 400),
+        "list_items": (3, 8),
+    },
+    "link-heavy": {
+        "blocks": {"heading": 1, "paragraph": 3, "unordered_list": 6, "image": 2},
+        "inline_density": 0.05,
+        "link_density": 0.6,
+        "paragraph_words": (40, 120),
+        "list_items": (10, 40),
+    },
+    "big-lists": {
+        "blocks": {"heading": 1, "unordered_list": 4, "ordered_list": 4},
+        "inline_density": 0.1,
+        "link_density": 0.1,
+        "paragraph_words": (20, 60),
+        "list_items": (50, 200),
+    },
+    "code": {
+        "blocks": {"heading": 1, "paragraph": 2, "code": 6},
+        "inline_density": 0.1,
+        "link_density": 0.02,
+        "paragraph_words": (20, 60),
+        "list_items": (3, 8),
+    },
+    "plain": {
+        "blocks": {"heading": 1, "paragraph": 8, "unordered_list": 2},
+        "inline_density": 0.0,
+        "link_density": 0.0,
+        "paragraph_words": (60, 200),
+        "list_items": (5, 15),
+    },
+}
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+
+class CorpusGenerator:
+    """
+    Deterministically generate markdown documents for benchmarking.
+
+    The same seed, profile and sizes always produce byte-identical output,
+    so benchmark results from different runs compare like with like.
+    """
+
+    def __init__(self, seed=0, profile="default", blocks_per_page=40):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown corpus profile: {profile}")
+        self.rng = random.Random(seed)
+        self.profile = PROFILES[profile]
+        self.blocks_per_page = blocks_per_page
+        kinds = self.profile["blocks"]
+        self._kinds = list(kinds)
+        self._weights = [kinds[kind] for kind in self._kinds]
+
+    def document(self, title):
+        """Generate one markdown document with the given H1 title."""
+        blocks = [f"# {title}"]
+        for _ in range(self.blocks_per_page):
+            kind = self.rng.choices(self._kinds, self._weights)[0]
+            blocks.append(getattr(self, f"_{kind}")())
+        return "\n\n".join(blocks) + "\n"
+
+    def _words(self, count):
+        return [self.rng.choice(WORDS) for _ in range(count)]
+
+    def _inline_text(self, count):
+        pieces = []
+        density = self.profile["inline_density"]
+        link_density = self.profile["link_density"]
+        for word in self._words(count):
+            roll = self.rng.random()
+            if roll < link_density:
+                pieces.append(f"[{word}](/{self.rng.choice(WORDS)}/{self.rng.randint(1, 999)})")
+            elif roll < link_density + density:
+                style = self.rng.randrange(4)
+                if style == 0:
+                    pieces.append(f"**{word}**")
+                elif style == 1:
+                    pieces.append(f"_{word}_")
+                elif style == 2:
+                    pieces.append(f"*{word}*")
+                else:
+                    pieces.append(f"`{word}`")
+            else:
+                pieces.append(word)
+        return " ".join(pieces)
+
+    def _heading(self):
+        level = self.rng.randint(2, 6)
+        return "#" * level + " " + " ".join(self._words(self.rng.randint(2, 6))).title()
+
+    def _paragraph(self):
+        low, high = self.profile["paragraph_words"]
+        words = self._inline_text(self.rng.randint(low, high))
+        # Wrap long paragraphs over several source lines like hand-written markdown
+        line_words = words.split(" ")
+        lines = [" ".join(line_words[i:i + 14]) for i in range(0, len(line_words), 14)]
+        return "\n".join(lines)
+
+    def _list_items(self):
+        low, high = self.profile["list_items"]
+        return [self._inline_text(self.rng.randint(3, 12))
+                for _ in range(self.rng.randint(low, high))]
+
+    def _unordered_list(self):
+        return "\n".join(f"- {item}" for item in self._list_items())
+
+    def _ordered_list(self):
+        return "\n".join(f"{i}. {item}" for i, item in enumerate(self._list_items(), 1))
+
+    def _quote(self):
+        return "\n".join(f"> {self._inline_text(self.rng.randint(6, 16))}"
+                         for _ in range(self.rng.randint(1, 4)))
+
+    def _code(self):
+        lines = []
+        for _ in range(self.rng.randint(3, 20)):
+            indent = "    " * self.rng.randint(0, 2)
+            lines.append(f"{indent}{self.rng.choice(WORDS)}({', '.join(self._words(2))})")
+        return "```\n" + "\n".join(lines) + "\n```"
+
+    def _image(self):
+        word = self.rng.choice(WORDS)
+        return f"![{word}](/images/{word}-{self.rng.randint(1, 99)}.png)"
+
+
+def generate_site(root_dir, pages=100, seed=0, profile="default", blocks_per_page=40,
+                  static_files=20, static_size=64 * 1024):
+    """
+    Write a synthetic site (content/, static/ and template.html) to root_dir.
+
+    Args:
+        root_dir: Directory to create the site in
+        pages: Number of markdown pages
+        seed: Random seed; the same arguments always give the same site
+        profile: Name of a feature mix in PROFILES
+        blocks_per_page: Number of blocks per page after the title
+        static_files: Number of binary static assets
+        static_size: Size in bytes of each static asset
+
+    Returns:
+        Dict with the content_dir, static_dir and template_path
+    """
+    generator = CorpusGenerator(seed, profile, blocks_per_page)
+    content_dir = os.path.join(root_dir, "content")
+    static_dir = os.path.join(root_dir, "static")
+    template_path = os.path.join(root_dir, "template.html")
+
+    for i in range(pages):
+        # Spread pages over nested sections like a real content tree
+        section = os.path.join(content_dir, f"section-{i % 10}", f"part-{i % 7}")
+        os.makedirs(section, exist_ok=True)
+        with open(os.path.join(section, f"page-{i}.md"), 'w', encoding='utf-8') as f:
+            f.write(generator.document(f"Page {i}"))
+
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(static_dir, "images"), exist_ok=True)
+    with open(os.path.join(static_dir, "index.css"), 'w', encoding='utf-8') as f:
+        f.write("body { font-family: serif; }\n" * 200)
+    for i in range(static_files):
+        with open(os.path.join(static_dir, "images", f"asset-{i}.png"), 'wb') as f:
+            f.write(rng.randbytes(static_size))
+
+    with open(template_path, 'w', encoding='utf-8') as f:
+        f.write(TEMPLATE)
+
+    return {"content_dir": content_dir, "static_dir": static_dir, "template_path": template_path}
@@ -0,0 +1,200 @@
+"""
+Run the benchmark suite.
+
+Usage (from the repository root):
+
+    python3 -m bench.run [--pages N] [--profile NAME] [--baseline PATH] [--save-baseline]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# The generator modules live in src/ and import each other by bare name
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from build import build_site  # noqa: E402
+from markdown_blocks import block_to_block_type, markdown_to_blocks, BlockType  # noqa: E402
+from markdown_to_html import markdown_to_html_node  # noqa: E402
+from split_nodes import text_to_textnodes  # noqa: E402
+
+from bench.corpus import PROFILES, generate_site  # noqa: E402
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def load_documents(content_dir):
+    documents = []
+    for dir_path, _, filenames in os.walk(content_dir):
+        for filename in sorted(filenames):
+            with open(os.path.join(dir_path, filename), 'r', encoding='utf-8') as f:
+                documents.append(f.read())
+    return documents
+
+
+def time_runs(func, repeat):
+    """Call func repeat times and return the wall time of each call in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def define_benchmarks(site, documents):
+    """
+    Build the benchmark table for a generated site.
+
+    Returns:
+        List of (name, callable, bytes processed per call) tuples
+    """
+    blocks = [block for document in documents for block in markdown_to_blocks(document)]
+    inline_texts = [block.replace('\n', ' ') for block in blocks
+                    if block_to_block_type(block) == BlockType.PARAGRAPH]
+    nodes = [markdown_to_html_node(document) for document in documents]
+
+    document_bytes = sum(len(document.encode('utf-8')) for document in documents)
+    block_bytes = sum(len(block.encode('utf-8')) for block in blocks)
+    inline_bytes = sum(len(text.encode('utf-8')) for text in inline_texts)
+
+    def end_to_end():
+        with tempfile.TemporaryDirectory() as dest_dir:
+            with contextlib.redirect_stdout(io.StringIO()):
+                build_site(site["content_dir"], site["static_dir"], site["template_path"],
+                           os.path.join(dest_dir, "docs"))
+
+    return [
+        ("markdown_to_blocks", lambda: [markdown_to_blocks(d) for d in documents], document_bytes),
+        ("block_to_block_type", lambda: [block_to_block_type(b) for b in blocks], block_bytes),
+        ("text_to_textnodes", lambda: [text_to_textnodes(t) for t in inline_texts], inline_bytes),
+        ("markdown_to_html_node", lambda: [markdown_to_html_node(d) for d in documents],
+         document_bytes),
+        ("to_html", lambda: [node.to_html() for node in nodes], document_bytes),
+        ("end_to_end", end_to_end, document_bytes),
+    ]
+
+
+def run_benchmarks(pages, profile, seed, repeat, only=None):
+    """
+    Generate a corpus and time every benchmark on it.
+
+    Returns:
+        Results dict suitable for JSON output and baseline comparison
+    """
+    with tempfile.TemporaryDirectory() as root_dir:
+        site = generate_site(root_dir, pages=pages, seed=seed, profile=profile)
+        documents = load_documents(site["content_dir"])
+
+        results = {}
+        for name, func, processed_bytes in define_benchmarks(site, documents):
+            if only and name not in only:
+                continue
+            times = time_runs(func, repeat)
+            best = min(times)
+            results[name] = {
+                "min": best,
+                "median": statistics.median(times),
+                "runs": len(times),
+                "mb_per_s": processed_bytes / best / 1e6 if best else None,
+            }
+            print(f"{name:<24}{best * 1000:>10.2f} ms  {results[name]['mb_per_s']:>8.2f} MB/s")
+
+    return {
+        "meta": {
+            "pages": pages,
+            "profile": profile,
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Compare results with a stored baseline.
+
+    Args:
+        results: Output of run_benchmarks
+        baseline: Previously saved output of run_benchmarks
+        tolerance: Allowed slowdown as a fraction (0.1 means 10% slower)
+
+    Returns:
+        List of (name, ratio) for benchmarks slower than the tolerance allows
+    """
+    if baseline.get("meta", {}).get("pages") != results["meta"]["pages"] or \
+            baseline.get("meta", {}).get("profile") != results["meta"]["profile"]:
+        print("Warning: baseline was recorded with a different corpus; comparison is approximate")
+
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            print(f"{name:<24}no baseline")
+            continue
+        ratio = result["min"] / base["min"]
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"{name:<24}{ratio:>8.2f}x baseline  {status}")
+        if status != "ok":
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the static site generator.")
+    parser.add_argument("--pages", type=int, default=100, help="pages in the synthetic corpus")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default",
+                        help="feature mix of the synthetic corpus")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--only", action="append", metavar="NAME",
+                        help="run only the named benchmark (repeatable)")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed slowdown against the baseline (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.pages, args.profile, args.seed, args.repeat, args.only)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
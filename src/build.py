@@ -0,0 +1,195 @@
+import os
+
+from fastcopy import format_strategy_counts, take_strategy_counts
+from fingerprint import ASSET_MANIFEST_FILENAME, fingerprint_assets, save_asset_manifest
+import inline_cache
+from manifest import (
+    diff_hashes,
+    full_rebuild_reason,
+    hash_file,
+    hash_tree,
+    load_manifest,
+    MANIFEST_FILENAME,
+    new_manifest,
+    save_manifest,
+)
+from pagegen import generate_pages, generate_pages_recursive, page_dest_path
+from precompress import precompress_outputs, remove_siblings
+import report
+from split_nodes import take_inline_stats
+import staging
+from staging import discard_staging_dir, prepare_staging_dir, swap_in
+from static_files import copy_static_to_public
+
+
+def build_site(content_dir, static_dir, template_path, dest_dir, basepath="/", incremental=False,
+               jobs=1, checksum=False, copy_strategy="auto", copy_jobs=1, fingerprint=False,
+               precompress=False):
+    """
+    Build the whole site into dest_dir and record a build manifest.
+
+    A full build is written to a staging directory next to dest_dir and
+    swapped in once it is complete, so the previous output stays servable
+    during the build. Files identical to the previous output are hardlinked
+    from it instead of rewritten.
+
+    In incremental mode the manifest of the previous build is used to
+    regenerate only the pages whose sources changed and to delete outputs
+    whose sources disappeared, in place, and static files are synced like
+    rsync does. A change of template, basepath, fingerprinted asset names
+    or generator version falls back to a full rebuild.
+
+    With fingerprint, static assets are written as name.<hash>.ext, the
+    mapping is saved as asset-manifest.json and pages and the template
+    link to the fingerprinted names, so the assets can be cached forever.
+
+    With precompress, HTML, CSS and JS outputs get a .gz sibling; siblings
+    of files that did not change since the previous build are reused.
+
+    Args:
+        content_dir: Directory containing the markdown content
+        static_dir: Directory containing the static assets
+        template_path: Path to the HTML template
+        dest_dir: Output directory
+        basepath: URL prefix the site is served from
+        incremental: Whether to reuse the previous build where possible
+        jobs: Number of processes used to generate pages (0 means one per CPU core)
+        checksum: Compare static files by contents instead of size and mtime
+        copy_strategy: How static files are copied; see fastcopy.STRATEGIES
+        copy_jobs: Number of threads copying static files (0 picks a default)
+        fingerprint: Put content hashes into static asset names
+        precompress: Write gzip siblings of text outputs
+
+    Returns:
+        The manifest written for this build
+    """
+    staging.take_output_stats()
+    take_strategy_counts()
+    take_inline_stats()
+    inline_cache.take_stats()
+    template_hash = hash_file(template_path)
+    page_hashes = hash_tree(content_dir, suffix='.md')
+    assets = fingerprint_assets(static_dir) if fingerprint else None
+
+    previous = load_manifest(dest_dir) if incremental or precompress else None
+    reason = (full_rebuild_reason(previous, template_hash, basepath, assets)
+              if incremental else None)
+    previous_compressed = (previous or {}).get("compressed") or {}
+
+    manifest = new_manifest(template_hash, basepath, assets)
+    manifest["pages"] = page_hashes
+
+    if incremental and reason is None:
+        _update_pages(previous["pages"], page_hashes, content_dir, template_path, dest_dir,
+                      basepath, jobs, assets)
+        # Generated pages live next to the static files; keep them
+        protect = [page_dest_path(rel_path) for rel_path in page_hashes] + [MANIFEST_FILENAME]
+        if assets is not None:
+            protect.append(ASSET_MANIFEST_FILENAME)
+        if precompress:
+            protect.extend(rel_path + ".gz" for rel_path in previous_compressed)
+        copy_static_to_public(static_dir, dest_dir, sync=True, checksum=checksum,
+                              protect=protect, strategy=copy_strategy, jobs=copy_jobs,
+                              assets=assets)
+        if assets is not None:
+            save_asset_manifest(dest_dir, assets)
+        if precompress:
+            manifest["compressed"] = _precompress(dest_dir, None, previous_compressed, jobs)
+        else:
+            remove_siblings(dest_dir, previous_compressed)
+        save_manifest(dest_dir, manifest)
+    else:
+        if reason is not None:
+            report.info(f"Full rebuild: {reason}")
+        _full_build(content_dir, static_dir, template_path, dest_dir, basepath, jobs, checksum,
+                    copy_strategy, copy_jobs, assets, precompress, previous_compressed, manifest)
+
+    stats = staging.output_stats
+    report.info(f"Wrote {stats.written} file(s), skipped {stats.skipped} unchanged")
+    report.info(f"Static copy strategy: {format_strategy_counts(take_strategy_counts())}")
+    inline_stats = take_inline_stats()
+    summary = f"Inline text: {inline_stats.plain} plain, {inline_stats.markup} with markup"
+    if inline_cache.current() is not None:
+        cache_stats = inline_cache.take_stats()
+        summary += f"; cache: {cache_stats.hits} hit(s), {cache_stats.misses} miss(es)"
+    report.info(summary)
+    return manifest
+
+
+def _full_build(content_dir, static_dir, template_path, dest_dir, basepath, jobs, checksum,
+                copy_strategy, copy_jobs, assets, precompress, previous_compressed, manifest):
+    staging_dir = prepare_staging_dir(dest_dir)
+    previous_dir = dest_dir if os.path.isdir(dest_dir) else None
+    report.info(f"Building into staging directory: {staging_dir}")
+
+    try:
+        # Copy static files to the staging directory
+        copy_static_to_public(static_dir, staging_dir, previous_dir, checksum=checksum,
+                              strategy=copy_strategy, jobs=copy_jobs, assets=assets)
+        if assets is not None:
+            save_asset_manifest(staging_dir, assets)
+
+        # Generate all pages recursively
+        generate_pages_recursive(content_dir, template_path, staging_dir, basepath, jobs,
+                                 previous_dir=previous_dir, assets=assets)
+
+        if precompress:
+            manifest["compressed"] = _precompress(staging_dir, previous_dir,
+                                                  previous_compressed, jobs)
+
+        save_manifest(staging_dir, manifest)
+    except BaseException:
+        discard_staging_dir(staging_dir)
+        raise
+
+    # Publish the finished build in one step
+    report.info(f"Publishing {staging_dir} -> {dest_dir}")
+    swap_in(staging_dir, dest_dir)
+
+
+def _precompress(dest_dir, previous_dir, previous_compressed, jobs):
+    compressed, stats = precompress_outputs(dest_dir, previous_dir, previous_compressed, jobs)
+    report.info(f"Precompressed {stats.compressed} file(s), reused {stats.reused}, "
+                f"skipped {stats.skipped}")
+    return compressed
+
+
+def _update_pages(old_hashes, new_hashes, content_dir, template_path, dest_dir, basepath, jobs,
+                  assets):
+    changed, removed = diff_hashes(old_hashes, new_hashes)
+    changed = _with_missing_outputs(changed, new_hashes, dest_dir, page_dest_path)
+
+    for rel_path in removed:
+        remove_output(dest_dir, page_dest_path(rel_path))
+
+    pages = [(os.path.join(content_dir, rel_path), os.path.join(dest_dir, page_dest_path(rel_path)))
+             for rel_path in changed]
+    generate_pages(pages, template_path, basepath, jobs, assets=assets)
+
+    report.info(f"Incremental build: {len(changed)} page(s) regenerated, {len(removed)} removed")
+
+
+def _with_missing_outputs(changed, new_hashes, dest_dir, output_path):
+    """Add unchanged pages whose output was deleted by hand to the changed list."""
+    changed_set = set(changed)
+    missing = [rel_path for rel_path in new_hashes
+               if rel_path not in changed_set
+               and not os.path.exists(os.path.join(dest_dir, output_path(rel_path)))]
+    return sorted(changed_set.union(missing))
+
+
+def remove_output(dest_dir, rel_path):
+    """Delete a stale output file, its .gz sibling and any directories it leaves empty."""
+    path = os.path.join(dest_dir, rel_path)
+    for stale_path in (path, path + ".gz"):
+        if os.path.exists(stale_path):
+            report.detail(f"Removing stale output: {stale_path}")
+            os.remove(stale_path)
+
+    parent = os.path.dirname(path)
+    while os.path.abspath(parent) != os.path.abspath(dest_dir):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
@@ -0,0 +1,157 @@
+import errno
+import os
+import shutil
+import threading
+from collections import Counter
+
+
+STRATEGIES = ("auto", "hardlink", "reflink", "copy_file_range", "sendfile", "copy")
+
+# Order in which "auto" tries the strategies, cheapest first. Hardlinks are
+# left out: an output linked to its source changes whenever the source file
+# is edited in place, bypassing the staging directory and the swap into docs/
+AUTO_ORDER = ("reflink", "copy_file_range", "sendfile", "copy")
+
+# Linux FICLONE ioctl: share the source's extents copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Errors meaning "this filesystem or platform can't do that", as opposed to real failures
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EMLINK,
+}
+
+# Strategies that failed as unsupported once are not tried again in this process
+_unsupported = set()
+
+# Number of files copied with each strategy since the last take_strategy_counts()
+_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def copy_file(source_path, dest_path, strategy="auto"):
+    """
+    Copy a file's contents and metadata with the cheapest strategy available.
+
+    Strategies:
+        hardlink: link dest_path to the source (same filesystem only); the
+            output then shares the source's inode, so editing the source
+            in place also changes the published file
+        reflink: copy-on-write clone of the source's data (Linux FICLONE)
+        copy_file_range: in-kernel copy with os.copy_file_range
+        sendfile: in-kernel copy with os.sendfile
+        copy: plain userspace copy
+        auto: the first of reflink, copy_file_range, sendfile and copy
+            that works, in that order
+
+    A strategy the platform or filesystem does not support falls back to
+    the next one ("copy" for an explicitly requested strategy) and is
+    skipped for the rest of the process.
+
+    Args:
+        source_path: File to copy
+        dest_path: File to create; it must not exist yet
+        strategy: One of STRATEGIES
+
+    Returns:
+        Name of the strategy that performed the copy
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown copy strategy: {strategy}")
+
+    candidates = AUTO_ORDER if strategy == "auto" else (strategy, "copy")
+    for name in candidates:
+        if name in _unsupported:
+            continue
+        try:
+            _COPIERS[name](source_path, dest_path)
+        except OSError as e:
+            if name == "copy" or e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _unsupported.add(name)
+            if os.path.lexists(dest_path):
+                os.remove(dest_path)
+            continue
+
+        if name != "hardlink":
+            # A hardlink already shares the source's metadata
+            shutil.copystat(source_path, dest_path)
+        with _counts_lock:
+            _counts[name] += 1
+        return name
+
+    raise OSError(errno.ENOTSUP, f"No copy strategy available for {source_path}")
+
+
+def take_strategy_counts():
+    """Return how many files each strategy copied and start counting from zero."""
+    with _counts_lock:
+        counts = dict(_counts)
+        _counts.clear()
+    return counts
+
+
+def format_strategy_counts(counts):
+    """Describe strategy counts for the build summary, e.g. "hardlink: 3, copy: 1"."""
+    if not counts:
+        return "none (no files copied)"
+    return ", ".join(f"{name}: {count}" for name, count in sorted(counts.items()))
+
+
+def _hardlink(source_path, dest_path):
+    if os.stat(source_path).st_dev != os.stat(os.path.dirname(dest_path) or ".").st_dev:
+        raise OSError(errno.EXDEV, "Source and destination are on different filesystems")
+    os.link(source_path, dest_path)
+
+
+def _reflink(source_path, dest_path):
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.ENOTSUP, "reflink needs fcntl") from None
+    with open(source_path, 'rb') as source, open(dest_path, 'wb') as dest:
+        fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+
+
+def _copy_file_range(source_path, dest_path):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "os.copy_file_range is not available")
+    with open(source_path, 'rb') as source, open(dest_path, 'wb') as dest:
+        remaining = os.fstat(source.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(source.fileno(), dest.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def _sendfile(source_path, dest_path):
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "os.sendfile is not available")
+    with open(source_path, 'rb') as source, open(dest_path, 'wb') as dest:
+        offset = 0
+        size = os.fstat(source.fileno()).st_size
+        while offset < size:
+            sent = os.sendfile(dest.fileno(), source.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+
+def _plain_copy(source_path, dest_path):
+    shutil.copyfile(source_path, dest_path)
+
+
+_COPIERS = {
+    "hardlink": _hardlink,
+    "reflink": _reflink,
+    "copy_file_range": _copy_file_range,
+    "sendfile": _sendfile,
+    "copy": _plain_copy,
+}
@@ -0,0 +1,77 @@
+import json
+import os
+import posixpath
+
+from manifest import hash_file
+from tree_walker import walk_tree
+
+
+# Written next to the assets so deploy tooling can find the current names
+ASSET_MANIFEST_FILENAME = "asset-manifest.json"
+
+# Hex digits of the content hash kept in fingerprinted names
+HASH_LENGTH = 10
+
+# Assets that are only reached through references the URL resolver
+# rewrites: stylesheets, scripts, images and fonts. Everything else, such
+# as robots.txt, favicon.ico, CNAME or HTML, keeps its name, because it is
+# fetched by a well-known URL or linked in ways that are never rewritten.
+FINGERPRINTED_PATTERNS = (
+    "*.css",
+    "*.js",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.avif",
+    "*.svg",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+)
+
+
+def fingerprinted_path(rel_path, digest):
+    """
+    Insert a content hash into an asset path.
+
+    Args:
+        rel_path: Asset path relative to the static dir, e.g. "css/extra.css"
+        digest: Hex digest of the asset's contents
+
+    Returns:
+        The path with the hash before the extension, e.g. "css/extra.0123456789.css"
+    """
+    dir_name, file_name = posixpath.split(rel_path)
+    stem, ext = posixpath.splitext(file_name)
+    return posixpath.join(dir_name, f"{stem}.{digest[:HASH_LENGTH]}{ext}")
+
+
+def fingerprint_assets(static_dir):
+    """
+    Work out the fingerprinted name of every cacheable static asset.
+
+    Only files matching FINGERPRINTED_PATTERNS are renamed; the rest are
+    copied under their own names and left out of the result.
+
+    Args:
+        static_dir: Directory containing the static assets
+
+    Returns:
+        Dict mapping asset paths relative to static_dir (with "/"
+        separators) to their fingerprinted paths
+    """
+    return {
+        rel_path: fingerprinted_path(rel_path, hash_file(entry.path))
+        for rel_path, entry in walk_tree(static_dir, include=FINGERPRINTED_PATTERNS)
+        if not entry.is_dir()
+    }
+
+
+def save_asset_manifest(dest_dir, assets):
+    """Write the original -> fingerprinted asset name mapping into the output directory."""
+    path = os.path.join(dest_dir, ASSET_MANIFEST_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(assets, f, indent=2, sort_keys=True)
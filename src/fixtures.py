@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+
+class TempDirMixin:
+    """
+    Give each test a fresh temporary directory, self.root.
+
+    Mix into a unittest.TestCase ahead of it. The directory is removed with
+    addCleanup, so tests need no tearDown of their own.
+    """
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def _read(self, path):
+        with open(path) as f:
+            return f.read()
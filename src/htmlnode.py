@@ -8,6 +8,9 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
     
+    def write_html(self, sink):
+        raise NotImplementedError("write_html method not implemented")
+    
     def props_to_html(self):
         if self.props is None:
             return ""
@@ -34,6 +37,19 @@ class LeafNode(HTMLNode):
             return self.value
         
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+    
+    def write_html(self, sink):
+        """Write the same HTML as to_html() to sink, one fragment at a time."""
+        if self.value is None:
+            raise ValueError("All leaf nodes must have a value")
+        
+        if self.tag is None:
+            sink.write(self.value)
+            return
+        
+        sink.write(f"<{self.tag}{self.props_to_html()}>")
+        sink.write(self.value)
+        sink.write(f"</{self.tag}>")
 
 
 class ParentNode(HTMLNode):
@@ -52,3 +68,56 @@ class ParentNode(HTMLNode):
             children_html += child.to_html()
         
         return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+    
+    def write_html(self, sink):
+        """Write the same HTML as to_html() to sink without building it as one string."""
+        if self.tag is None:
+            raise ValueError("All parent nodes must have a tag")
+        
+        if self.children is None:
+            raise ValueError("Parent node must have children")
+        
+        sink.write(f"<{self.tag}{self.props_to_html()}>")
+        for child in self.children:
+            child.write_html(sink)
+        sink.write(f"</{self.tag}>")
+
+
+class ChunkedWriter:
+    """
+    Buffer HTML fragments and pass them on to a file-like sink in chunks.
+
+    Small fragments are joined until chunk_size characters are buffered, so
+    the sink sees a few large writes instead of one per tag, while memory
+    use stays bounded by the chunk size rather than the page size.
+    """
+    
+    def __init__(self, sink, chunk_size=64 * 1024):
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self._fragments = []
+        self._size = 0
+    
+    def write(self, fragment):
+        if len(fragment) >= self.chunk_size:
+            # Pass big fragments straight through instead of copying them
+            self.flush()
+            self.sink.write(fragment)
+            return
+        
+        self._fragments.append(fragment)
+        self._size += len(fragment)
+        if self._size >= self.chunk_size:
+            self.flush()
+    
+    def flush(self):
+        if self._fragments:
+            self.sink.write("".join(self._fragments))
+            self._fragments = []
+            self._size = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+
+# Entries kept when no size is given: room for the nav, footer and
+# boilerplate lines repeated across a large site
+DEFAULT_MAXSIZE = 4096
+
+
+class InlineCacheStats:
+    """Count inline texts served from the cache and ones that had to be parsed."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def merge(self, other):
+        self.hits += other.hits
+        self.misses += other.misses
+
+    def __repr__(self):
+        return f"InlineCacheStats(hits: {self.hits}, misses: {self.misses})"
+
+
+class InlineCache:
+    """
+    Bounded LRU cache of parsed inline text, keyed by the raw text.
+
+    Values are stored as tuples of (text, text_type, url) tuples, so a
+    caller changing the nodes it was handed cannot change what later
+    callers get. When the cache is full, the least recently used entry is
+    dropped.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError(f"Inline cache size must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.stats = InlineCacheStats()
+        self._entries = OrderedDict()
+
+    def get(self, text):
+        """Return the cached value for text, or None, counting a hit or a miss."""
+        value = self._entries.get(text)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(text)
+        self.stats.hits += 1
+        return value
+
+    def put(self, text, value):
+        self._entries[text] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def take_stats(self):
+        """Return the counts recorded so far and start counting from zero."""
+        stats, self.stats = self.stats, InlineCacheStats()
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"InlineCache(entries: {len(self)}/{self.maxsize}, {self.stats})"
+
+
+# Cache of this process, or None while caching is off
+_cache = None
+
+
+def enable(maxsize=DEFAULT_MAXSIZE):
+    """Start caching with an empty cache of at most maxsize entries and return it."""
+    global _cache
+    _cache = InlineCache(maxsize)
+    return _cache
+
+
+def disable():
+    global _cache
+    _cache = None
+
+
+def current():
+    return _cache
+
+
+def take_stats():
+    """Return and reset the current cache's counts (all zero while caching is off)."""
+    if _cache is None:
+        return InlineCacheStats()
+    return _cache.take_stats()
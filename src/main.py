@@ -1,15 +1,67 @@
+import argparse
 import os
 import sys
-from textnode import TextNode, TextType
-from static_files import copy_static_to_public
+import inline_cache
+import report
+import timings
+from build import build_site
+from fastcopy import STRATEGIES
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate the static site into docs/.")
+    parser.add_argument("basepath", nargs="?", default="/",
+                        help="URL prefix the site is served from (default: /)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only rebuild outputs whose sources changed since the last build")
+    parser.add_argument("--checksum", action="store_true",
+                        help="compare static files by contents instead of size and mtime")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="write CSS, JS, image and font assets as name.<hash>.ext and "
+                             "link pages to those names")
+    parser.add_argument("--precompress", action="store_true",
+                        help="write .gz siblings of HTML, CSS and JS outputs")
+    parser.add_argument("--copy-strategy", choices=STRATEGIES, default="auto",
+                        help="how static files are copied (default: auto picks the cheapest "
+                             "of reflink, copy_file_range, sendfile, copy; hardlink shares "
+                             "inodes, so in-place edits under static/ reach docs/ directly)")
+    parser.add_argument("--copy-jobs", type=int, default=1, metavar="N",
+                        help="copy static files on N threads (0 = pick a default)")
+    parser.add_argument("--inline-cache", type=int, default=0, metavar="N",
+                        help="reuse the parsed inline markup of up to N repeated texts "
+                             "per process (default: 0, off)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="generate pages in N worker processes (0 = one per CPU core)")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("--verbose", "-v", action="store_true",
+                           help="list every generated page and copied file")
+    verbosity.add_argument("--quiet", "-q", action="store_true",
+                           help="only print warnings and errors")
+    parser.add_argument("--watch", action="store_true",
+                        help="serve docs/ locally and rebuild changed pages as sources change")
+    parser.add_argument("--port", type=int, default=8888,
+                        help="port for the --watch server (default: 8888)")
+    parser.add_argument("--timings", action="store_true",
+                        help="print per-stage build timings and the slowest pages "
+                             "(block_split includes block classification, done in the same pass)")
+    parser.add_argument("--timings-top", type=int, default=10, metavar="N",
+                        help="number of slowest pages listed by --timings (default: 10)")
+    parser.add_argument("--timings-json", metavar="PATH",
+                        help="also write the timings as JSON to PATH (implies --timings)")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or a positive number")
+    if args.copy_jobs < 0:
+        parser.error("--copy-jobs must be 0 or a positive number")
+    if args.inline_cache < 0:
+        parser.error("--inline-cache must be 0 or a positive number")
+    return args
 
 
 def main():
-    # Get basepath from command line argument, default to "/"
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
-    
+    # Get basepath and build options from the command line
+    args = parse_args(sys.argv[1:])
+
     # Get the project root directory (parent of src)
     current_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(current_dir)
@@ -20,20 +72,39 @@ def main():
     content_dir = os.path.join(project_root, "content")
     template_html = os.path.join(project_root, "template.html")
 
-    # Clean docs directory if it exists
-    if os.path.exists(docs_dir):
-        import shutil
-        print(f"Deleting existing docs directory: {docs_dir}")
-        shutil.rmtree(docs_dir)
+    if args.verbose:
+        report.configure(report.VERBOSE)
+    elif args.quiet:
+        report.configure(report.QUIET)
+    if args.inline_cache:
+        inline_cache.enable(args.inline_cache)
+
+    if args.watch:
+        from watch import serve_and_watch
+        serve_and_watch(content_dir, static_dir, template_html, docs_dir, args.basepath,
+                        port=args.port)
+        return
+
+    build_timings = None
+    if args.timings or args.timings_json:
+        build_timings = timings.enable()
 
-    # Copy static files to docs directory
-    copy_static_to_public(static_dir, docs_dir)
+    try:
+        build_site(content_dir, static_dir, template_html, docs_dir, args.basepath,
+                   incremental=args.incremental, jobs=args.jobs,
+                   checksum=args.checksum, copy_strategy=args.copy_strategy,
+                   copy_jobs=args.copy_jobs, fingerprint=args.fingerprint,
+                   precompress=args.precompress)
+    finally:
+        # Clear the progress line and print the warnings collected during the build
+        report.finish()
 
-    # Generate all pages recursively
-    from pagegen import generate_pages_recursive
-    generate_pages_recursive(content_dir, template_html, docs_dir, basepath)
+    if build_timings is not None:
+        print(build_timings.report(args.timings_top))
+        if args.timings_json:
+            build_timings.write_json(args.timings_json)
 
-    print("Static site generation completed!")
+    report.info("Static site generation completed!")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+
+from tree_walker import walk_tree
+
+
+# Bump this whenever a change to the generator alters the HTML it produces,
+# so that incremental builds made by an older generator are thrown away.
+GENERATOR_VERSION = "2"
+
+MANIFEST_FILENAME = ".build-manifest.json"
+
+
+def hash_file(path):
+    """
+    Compute the SHA-256 hex digest of a file's contents.
+
+    Args:
+        path: Path to the file to hash
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_tree(root_dir, suffix=None):
+    """
+    Hash every file below a directory, skipping the files walk_tree ignores.
+
+    Args:
+        root_dir: Directory to walk
+        suffix: Optional file suffix (e.g. ".md") to restrict the walk to
+
+    Returns:
+        Dict mapping paths relative to root_dir (with "/" separators) to hex digests
+    """
+    include = (f"*{suffix}",) if suffix is not None else None
+    return {rel_path: hash_file(entry.path)
+            for rel_path, entry in walk_tree(root_dir, include=include)
+            if not entry.is_dir()}
+
+
+def new_manifest(template_hash, basepath, assets=None):
+    """Create an empty manifest for the current generator, template, basepath and asset names."""
+    return {
+        "version": GENERATOR_VERSION,
+        "template": template_hash,
+        "basepath": basepath,
+        "assets": assets,
+        "pages": {},
+        "compressed": {},
+    }
+
+
+def load_manifest(dest_dir):
+    """
+    Load the build manifest stored in an output directory.
+
+    Args:
+        dest_dir: Output directory of a previous build
+
+    Returns:
+        The manifest dict, or None if there is no readable manifest
+    """
+    path = os.path.join(dest_dir, MANIFEST_FILENAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(manifest, dict):
+        return None
+    return manifest
+
+
+def save_manifest(dest_dir, manifest):
+    """Write the build manifest into the output directory."""
+    os.makedirs(dest_dir, exist_ok=True)
+    path = os.path.join(dest_dir, MANIFEST_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def full_rebuild_reason(manifest, template_hash, basepath, assets=None):
+    """
+    Decide whether a previous build can be updated incrementally.
+
+    Args:
+        manifest: Manifest of the previous build (or None)
+        template_hash: Hash of the current template
+        basepath: Basepath of the current build
+        assets: Fingerprinted asset names of the current build (or None)
+
+    Returns:
+        A human readable reason for a full rebuild, or None if an
+        incremental build is possible
+    """
+    if manifest is None:
+        return "no previous build manifest"
+    if manifest.get("version") != GENERATOR_VERSION:
+        return "generator version changed"
+    if manifest.get("template") != template_hash:
+        return "template changed"
+    if manifest.get("basepath") != basepath:
+        return "basepath changed"
+    if manifest.get("assets") != assets:
+        # Every page may embed the URL of a renamed asset
+        return "asset fingerprints changed"
+    return None
+
+
+def diff_hashes(old_hashes, new_hashes):
+    """
+    Compare two {relative path: hash} mappings.
+
+    Returns:
+        Tuple (changed, removed) of sorted relative paths; changed covers
+        both new and modified entries
+    """
+    changed = sorted(path for path, digest in new_hashes.items()
+                     if old_hashes.get(path) != digest)
+    removed = sorted(path for path in old_hashes if path not in new_hashes)
+    return changed, removed
@@ -1,3 +1,4 @@
+import re
 from enum import Enum
 
 
@@ -10,28 +11,218 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
-def markdown_to_blocks(markdown):
+# A heading line: 1-6 # characters followed by a space
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+
+# End of a line followed by one or more blank (empty or whitespace-only) lines
+BLOCK_SEPARATOR_PATTERN = re.compile(r"\n(?:[^\S\n]*\n)+")
+
+class Block:
+    """
+    A classified markdown block with its markers already parsed off.
+    
+    Which attributes are set depends on the type:
+    - HEADING: level (1-6) and text
+    - PARAGRAPH: text, with the line breaks turned into spaces
+    - CODE: text, the lines between the ``` fences
+    - QUOTE: text, the lines without their "> " markers
+    - UNORDERED_LIST / ORDERED_LIST: items, the texts after "- " or "N. "
+    """
+    
+    def __init__(self, block_type, text=None, items=None, level=None):
+        self.block_type = block_type
+        self.text = text
+        self.items = items
+        self.level = level
+    
+    def __eq__(self, other):
+        return (self.block_type == other.block_type and
+                self.text == other.text and
+                self.items == other.items and
+                self.level == other.level)
+    
+    def __repr__(self):
+        return f"Block({self.block_type.value}, {self.text!r}, {self.items!r}, {self.level})"
+
+
+def parse_blocks(markdown):
     """
-    Split a raw markdown string into blocks based on double newlines.
+    Split a markdown document into parsed blocks.
+    
+    Blocks are separated by blank (empty or whitespace-only) lines, except
+    inside a ``` fence, so code containing blank lines stays one block. A
+    fence that is never closed does not swallow the rest of the document;
+    its blank lines separate blocks as usual. Each block is then classified
+    and parsed by parse_block in one pass over its lines.
     
     Args:
         markdown: Raw markdown text string representing a full document
     
+    Yields:
+        Block objects in document order
+    """
+    for start, end in _block_spans(markdown):
+        yield parse_block(markdown[start:end])
+
+
+def iter_blocks(lines):
+    """
+    Parse a markdown document into blocks while reading it.
+    
+    Only the lines of the current block are held in memory, so a large
+    file can be converted without reading it whole. The blocks are the
+    same as parse_blocks would return for the whole text. A ``` fence
+    that is still open at the end of the document is buffered up to the
+    end, then split on blank lines like parse_blocks does.
+    
+    Args:
+        lines: Iterable of lines ending in "\n", e.g. a file opened in
+            text mode
+    
+    Yields:
+        Block objects in document order
+    """
+    pending = []
+    in_fence = False
+    for line in lines:
+        if not in_fence and (not line or line.isspace()):
+            # Blank line: the end of the current block
+            if pending:
+                yield parse_block("".join(pending).strip())
+                pending = []
+            continue
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        pending.append(line)
+    
+    if in_fence:
+        # Never closed, so the fence does not hold the blocks together
+        yield from parse_blocks("".join(pending))
+    elif pending:
+        yield parse_block("".join(pending).strip())
+
+
+def parse_block(block):
+    """
+    Classify a markdown block and strip its markers in one pass.
+    
+    Args:
+        block: A single block of markdown text (already stripped of leading/trailing whitespace)
+    
     Returns:
-        List of block strings with leading/trailing whitespace stripped
-        and empty blocks removed
+        Block with the type and the parsed contents
     """
-    # Split on double newlines to separate blocks
-    blocks = markdown.split('\n\n')
+    heading = HEADING_PATTERN.match(block)
+    if heading:
+        level = heading.end() - 1
+        return Block(BlockType.HEADING, text=block[level:].strip(), level=level)
+    
+    if block.startswith('```') and block.endswith('```'):
+        first_newline = block.find('\n')
+        last_newline = block.rfind('\n')
+        body = block[first_newline + 1:last_newline] if first_newline < last_newline else ""
+        return Block(BlockType.CODE, text=body)
+    
+    if block.startswith('>'):
+        quote_lines = []
+        for line in block.split('\n'):
+            if line.startswith('> '):
+                quote_lines.append(line[2:])
+            elif line.startswith('>'):
+                quote_lines.append(line[1:])
+            else:
+                break
+        else:
+            return Block(BlockType.QUOTE, text='\n'.join(quote_lines))
+    elif block.startswith('- '):
+        items = []
+        for line in block.split('\n'):
+            if not line.startswith('- '):
+                break
+            items.append(line[2:])
+        else:
+            return Block(BlockType.UNORDERED_LIST, items=items)
+    elif block.startswith('1. '):
+        items = []
+        for number, line in enumerate(block.split('\n'), 1):
+            prefix = f"{number}. "
+            if not line.startswith(prefix):
+                break
+            items.append(line[len(prefix):])
+        else:
+            return Block(BlockType.ORDERED_LIST, items=items)
+    
+    return Block(BlockType.PARAGRAPH, text=block.replace('\n', ' '))
+
+
+def _block_spans(markdown):
+    """Yield the (start, end) offsets of the stripped blocks, as described in parse_blocks."""
+    # Pair up fence lines; an unpaired last one opens nothing
+    fences = _fence_lines(markdown)
+    if len(fences) % 2:
+        fences.pop()
+    fence_index = 0
     
-    # Strip whitespace and filter out empty blocks
-    filtered_blocks = []
-    for block in blocks:
-        stripped_block = block.strip()
-        if stripped_block:  # Only add non-empty blocks
-            filtered_blocks.append(stripped_block)
+    block_start = 0
+    for separator in BLOCK_SEPARATOR_PATTERN.finditer(markdown):
+        position = separator.start()
+        # Skip the fences that closed before this separator
+        while fence_index < len(fences) and fences[fence_index + 1] < position:
+            fence_index += 2
+        if fence_index < len(fences) and fences[fence_index] < position:
+            # Blank lines inside a fenced code block
+            continue
+        span = _strip_span(markdown, block_start, position)
+        if span is not None:
+            yield span
+        block_start = separator.end()
     
-    return filtered_blocks
+    span = _strip_span(markdown, block_start, len(markdown))
+    if span is not None:
+        yield span
+
+
+def _fence_lines(markdown):
+    """Offsets of the lines starting with ``` (after optional indentation)."""
+    fences = []
+    position = markdown.find("```")
+    while position != -1:
+        line_start = markdown.rfind("\n", 0, position) + 1
+        if line_start == position or markdown[line_start:position].isspace():
+            fences.append(line_start)
+            # Only the first ``` of a line counts
+            next_line = markdown.find("\n", position)
+            if next_line == -1:
+                break
+            position = markdown.find("```", next_line)
+        else:
+            position = markdown.find("```", position + 3)
+    return fences
+
+
+def _strip_span(markdown, start, end):
+    """Narrow a span like str.strip() would, or return None if nothing is left."""
+    while start < end and markdown[start].isspace():
+        start += 1
+    while end > start and markdown[end - 1].isspace():
+        end -= 1
+    if start == end:
+        return None
+    return start, end
+
+
+def markdown_to_blocks(markdown):
+    """
+    Split a raw markdown string into blocks separated by blank lines.
+    
+    Args:
+        markdown: Raw markdown text string representing a full document
+    
+    Returns:
+        List of block strings with leading/trailing whitespace stripped
+        and empty blocks removed; fenced code blocks are kept whole
+    """
+    return [markdown[start:end] for start, end in _block_spans(markdown)]
 
 
 def block_to_block_type(block):
@@ -44,38 +235,4 @@ def block_to_block_type(block):
     Returns:
         BlockType enum representing the type of block
     """
-    lines = block.split('\n')
-    
-    # Check for heading (1-6 # characters followed by space)
-    if block.startswith(('#', '##', '###', '####', '#####', '######')):
-        # Must have space after the # characters
-        heading_match = block.split(' ', 1)
-        if len(heading_match) > 1 and all(c == '#' for c in heading_match[0]) and 1 <= len(heading_match[0]) <= 6:
-            return BlockType.HEADING
-    
-    # Check for code block (starts and ends with 3 backticks)
-    if block.startswith('```') and block.endswith('```'):
-        return BlockType.CODE
-    
-    # Check for quote block (every line starts with >)
-    if all(line.startswith('>') for line in lines):
-        return BlockType.QUOTE
-    
-    # Check for unordered list (every line starts with - followed by space)
-    if all(line.startswith('- ') for line in lines):
-        return BlockType.UNORDERED_LIST
-    
-    # Check for ordered list (every line starts with number. followed by space, starting at 1)
-    is_ordered_list = True
-    for i, line in enumerate(lines):
-        expected_number = i + 1
-        expected_prefix = f"{expected_number}. "
-        if not line.startswith(expected_prefix):
-            is_ordered_list = False
-            break
-    
-    if is_ordered_list and len(lines) > 0:
-        return BlockType.ORDERED_LIST
-    
-    # Default to paragraph
-    return BlockType.PARAGRAPH
+    return parse_block(block).block_type
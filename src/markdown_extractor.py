@@ -1,6 +1,14 @@
 import re
 
 
+# Markdown image: ![alt text](url)
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+# Markdown link: [anchor text](url); the negative lookbehind (?<!!)
+# excludes images, which start with !
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+
 def extract_markdown_images(text):
     """
     Extract markdown images from text.
@@ -11,10 +19,7 @@ def extract_markdown_images(text):
     Returns:
         List of tuples containing (alt_text, url) for each image found
     """
-    # Regex pattern for markdown images: ![alt text](url)
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
@@ -27,8 +32,40 @@ def extract_markdown_links(text):
     Returns:
         List of tuples containing (anchor_text, url) for each link found
     """
-    # Regex pattern for markdown links: [anchor text](url)
-    # Uses negative lookbehind (?<!) to exclude images (which start with !)
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
+    return LINK_PATTERN.findall(text)
+
+
+def extract_markdown_images_and_links(text):
+    """
+    Extract markdown images and links from text in document order.
+    
+    Images take precedence, as when images are split out before links:
+    every match of extract_markdown_images is kept, and links are only
+    looked for in the text between the images. A link overlapping an
+    image, as in "[a](![b)](c)", is therefore not reported.
+    
+    Args:
+        text: Raw markdown text string
+        
+    Returns:
+        List of tuples (kind, text, url, start, end), where kind is "image"
+        or "link" and text[start:end] is the markdown of the match
+    """
+    matches = []
+    text_start = 0
+    for image in IMAGE_PATTERN.finditer(text):
+        _append_links(text, text_start, image.start(), matches)
+        matches.append(("image",) + image.groups() + image.span())
+        text_start = image.end()
+    _append_links(text, text_start, len(text), matches)
     return matches
+
+
+def _append_links(text, start, end, matches):
+    """Append the links found in text[start:end] to matches."""
+    if start == end:
+        return
+    # Text before start is the end of an image (")") or nothing, so the
+    # lookbehind sees the same as it would in the sliced text
+    for link in LINK_PATTERN.finditer(text, start, end):
+        matches.append(("link",) + link.groups() + link.span())
@@ -0,0 +1,68 @@
+import re
+
+
+# Matches the placeholders the page template may contain, e.g. "{{ Title }}"
+SLOT_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+
+
+class PageTemplate:
+    """
+    A page template compiled once per build.
+
+    The template text is split up front into literal segments and named
+    slots, so rendering a page is a single join instead of repeated
+    full-page string replacements.
+    """
+
+    def __init__(self, text, urls=None):
+        # Resolve the template's own href/src URLs once, at compile time
+        if urls is not None:
+            text = urls.resolve_html(text)
+        # re.split with a capturing group alternates literal segments (even
+        # indices) and slot names (odd indices)
+        self.parts = SLOT_PATTERN.split(text)
+        self.slots = [(index, self.parts[index]) for index in range(1, len(self.parts), 2)]
+
+    @classmethod
+    def from_file(cls, path, urls=None):
+        """Read and compile the template stored at path, resolving its URLs with urls."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), urls)
+
+    def render(self, title, content):
+        """
+        Fill the template slots.
+
+        Args:
+            title: Text for the {{ Title }} slot
+            content: HTML for the {{ Content }} slot
+
+        Returns:
+            The complete page as a string
+        """
+        values = {"Title": title, "Content": content}
+        pieces = list(self.parts)
+        for index, name in self.slots:
+            pieces[index] = values[name]
+        return "".join(pieces)
+
+    def write(self, sink, title, write_content):
+        """
+        Stream the filled template to sink.
+
+        Args:
+            sink: Object with a write(str) method
+            title: Text for the {{ Title }} slot
+            write_content: Callable that writes the {{ Content }} HTML to sink
+        """
+        for index, part in enumerate(self.parts):
+            if index % 2 == 0:
+                if part:
+                    sink.write(part)
+            elif part == "Title":
+                sink.write(title)
+            else:
+                write_content(sink)
+
+    def __repr__(self):
+        return f"PageTemplate(slots: {[name for _, name in self.slots]})"
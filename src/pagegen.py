@@ -1,63 +1,331 @@
+import itertools
+from htmlnode import ChunkedWriter, ParentNode
+import inline_cache
+from markdown_to_html import iter_html_nodes
+from page_template import PageTemplate
+import report
+import split_nodes
+import staging
+from staging import OutputFile
+from url_resolver import UrlResolver
+import timings
+from tree_walker import walk_tree
+
+
 def extract_title(markdown):
     """
     Extract the first H1 header from the markdown string and return its text.
     Raises ValueError if no H1 header is found.
     """
     for line in markdown.splitlines():
-        if line.strip().startswith('# '):
-            return line.strip()[2:].strip()
+        title = _line_title(line)
+        if title is not None:
+            return title
     raise Exception("No H1 header found in markdown")
 
 
-def generate_page(from_path, template_path, dest_path, basepath="/"):
+def _line_title(line):
+    """The H1 text of a single line, or None if the line is not an H1."""
+    line = line.strip()
+    if line.startswith('# '):
+        return line[2:].strip()
+    return None
+
+
+class _TitleFinder:
+    """Pass markdown lines through, picking up the title (as extract_title would) on the way."""
+    
+    def __init__(self, lines):
+        self._lines = lines
+        self.title = None
+    
+    def __iter__(self):
+        for line in self._lines:
+            if self.title is None:
+                for part in line.splitlines():
+                    self.title = _line_title(part)
+                    if self.title is not None:
+                        break
+            yield line
+
+
+def _stream_title_and_html(source, urls):
+    """
+    Start converting an open markdown file without reading it whole.
+    
+    The template needs the title before any content is written, so the
+    nodes converted up to the line holding the title are kept; for most
+    pages that is the first block.
+    
+    Returns:
+        Tuple (title, node), where node is the page's content <div>; its
+        children are converted from the rest of the file as write_html
+        reaches them, so it can be written only once
+    """
+    lines = _TitleFinder(source)
+    nodes = iter_html_nodes(lines, urls)
+    converted = []
+    for node in nodes:
+        converted.append(node)
+        if lines.title is not None:
+            break
+    if lines.title is None:
+        raise Exception("No H1 header found in markdown")
+    # The same <div> markdown_to_html_node wraps the blocks in
+    return lines.title, ParentNode("div", itertools.chain(converted, nodes))
+
+
+def page_dest_path(rel_path):
+    """Map a markdown path (relative to the content dir) to its HTML output path."""
+    # Only the file's own suffix; directory names may contain ".md" too
+    return rel_path[:-len('.md')] + '.html'
+
+
+def generate_page(from_path, template_path, dest_path, basepath="/", template=None,
+                  previous_path=None, assets=None):
     import os
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    # Read markdown
-    with open(from_path, 'r', encoding='utf-8') as f:
-        markdown = f.read()
-    # Read template
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template = f.read()
-    # Convert markdown to HTML
-    from markdown_to_html import markdown_to_html_node
-    html = markdown_to_html_node(markdown).to_html()
-    # Extract title
-    title = extract_title(markdown)
-    # Replace placeholders
-    page = template.replace('{{ Title }}', title).replace('{{ Content }}', html)
-    
-    # Replace absolute paths with basepath
-    page = page.replace('href="/', f'href="{basepath}')
-    page = page.replace('src="/', f'src="{basepath}')
+    import time
+    report.detail(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    started = time.perf_counter()
+    page_timings = timings.begin_page(from_path)
+    try:
+        _render_page(from_path, template_path, dest_path, basepath, template, previous_path,
+                     assets, page_timings)
+    finally:
+        if page_timings is not None:
+            page_timings.total = time.perf_counter() - started
+        timings.end_page(page_timings)
+    report.advance("pages")
+
+
+def _render_page(from_path, template_path, dest_path, basepath, template, previous_path,
+                 assets, page_timings):
+    import os
+    # Links and images are resolved against the basepath (and fingerprinted
+    # asset names) as nodes are built
+    urls = UrlResolver(basepath, assets)
+    # Compile the template unless the caller already compiled it for this
+    # build (and basepath)
+    if template is None:
+        template = PageTemplate.from_file(template_path, urls)
+    # The stages nest as the page streams through; with timings off these
+    # are no-ops
+    stages = timings.current_page()
     
     # Ensure destination directory exists
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    # Write output
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(page)
+    with open(from_path, 'r', encoding='utf-8') as source:
+        # Parse, convert and write one block at a time, so memory use does
+        # not grow with the size of the markdown file
+        title, content = _stream_title_and_html(stages.iter_stage("read", source), urls)
+        if page_timings is not None:
+            content.children = _counted_nodes(content.children, page_timings)
+        
+        def write_content(sink):
+            with stages.stage("to_html"):
+                content.write_html(sink)
+        
+        # Compared with the previous build's page as it is written; the
+        # file is only written (and renamed into place) if it changed
+        with OutputFile(dest_path, previous_path) as output:
+            sink = output if page_timings is None else _TimedSink(output, page_timings)
+            with ChunkedWriter(sink) as writer:
+                with stages.stage("template_fill"):
+                    template.write(writer, title, write_content)
+    
+    if page_timings is not None:
+        page_timings.input_bytes = os.path.getsize(from_path)
+        page_timings.output_bytes = os.path.getsize(dest_path)
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
-    import os
+def _counted_nodes(nodes, page_timings):
+    """Pass a page's block nodes through, counting them (and the <div> around them)."""
+    page_timings.nodes += 1
+    for node in nodes:
+        page_timings.blocks += 1
+        page_timings.nodes += timings.count_nodes(node)
+        yield node
+
+
+class _TimedSink:
+    """File wrapper counting the time spent in its writes toward the "write" stage."""
     
-    # Get all entries in the content directory
-    for entry in os.listdir(dir_path_content):
-        entry_path = os.path.join(dir_path_content, entry)
-        
-        if os.path.isfile(entry_path):
-            # If it's a markdown file, generate HTML page
-            if entry.endswith('.md'):
-                # Calculate the destination HTML file path
-                html_filename = entry.replace('.md', '.html')
-                dest_file_path = os.path.join(dest_dir_path, html_filename)
-                
-                # Generate the page
-                generate_page(entry_path, template_path, dest_file_path, basepath)
-        else:
-            # If it's a directory, recurse into it
-            # Create corresponding directory in destination
-            dest_subdir = os.path.join(dest_dir_path, entry)
-            os.makedirs(dest_subdir, exist_ok=True)
-            
-            # Recursively process the subdirectory
-            generate_pages_recursive(entry_path, template_path, dest_subdir, basepath)
+    def __init__(self, sink, page_timings):
+        self._sink = sink
+        self._page_timings = page_timings
+    
+    def write(self, text):
+        with self._page_timings.stage("write"):
+            self._sink.write(text)
+
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/", jobs=1,
+                             previous_dir=None, assets=None):
+    """
+    Generate a page for every markdown file under dir_path_content.
+
+    Serial and parallel builds both go through generate_pages, so a failing
+    page never stops the others and every failure is reported together in
+    a PageGenerationError.
+
+    Args:
+        dir_path_content: Directory containing the markdown content
+        template_path: Path to the HTML template
+        dest_dir_path: Output directory
+        basepath: URL prefix the site is served from
+        jobs: Number of worker processes (0 means one per CPU core)
+        previous_dir: Optional previous output to reuse identical pages from
+        assets: Optional map of static asset paths to fingerprinted paths
+    """
+    pages = collect_pages(dir_path_content, dest_dir_path)
+    generate_pages(pages, template_path, basepath, jobs, dest_dir_path, previous_dir, assets)
+
+
+class PageGenerationError(Exception):
+    """Raised after a batch of pages was generated and some of them failed."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        lines = [f"{len(failures)} page(s) failed to generate:"]
+        for from_path, error in failures:
+            lines.append(f"  {from_path}: {error}")
+        super().__init__("\n".join(lines))
+
+
+def collect_pages(dir_path_content, dest_dir_path):
+    """
+    Walk the content tree and list the pages to generate.
+
+    Args:
+        dir_path_content: Directory containing the markdown content
+        dest_dir_path: Output directory
+
+    Returns:
+        Sorted list of (markdown path, HTML destination path) tuples
+    """
+    import os
+
+    pages = []
+    for rel_path, entry in walk_tree(dir_path_content, include=("*.md",)):
+        if not entry.is_dir():
+            dest_path = os.path.join(dest_dir_path, *page_dest_path(rel_path).split("/"))
+            pages.append((entry.path, dest_path))
+    pages.sort()
+    return pages
+
+
+def generate_pages(pages, template_path, basepath="/", jobs=1, dest_dir_path=None,
+                   previous_dir=None, assets=None):
+    """
+    Generate a list of pages, optionally across several worker processes.
+
+    Pages are handed to the pool in chunks and their log lines are printed
+    in input order, so the output does not depend on scheduling. A failing
+    page does not stop the others; all failures are raised together at
+    the end as a PageGenerationError.
+
+    Args:
+        pages: List of (markdown path, HTML destination path) tuples
+        template_path: Path to the HTML template
+        basepath: URL prefix the site is served from
+        jobs: Number of worker processes (0 means one per CPU core)
+        dest_dir_path: Output directory the destination paths are below
+        previous_dir: Optional previous output; pages identical to the
+            previous build are hardlinked from there instead of written
+        assets: Optional map of static asset paths to fingerprinted paths
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(pages))
+
+    tasks = []
+    for from_path, dest_path in pages:
+        previous_path = None
+        if previous_dir is not None:
+            previous_path = os.path.join(previous_dir, os.path.relpath(dest_path, dest_dir_path))
+        tasks.append((from_path, template_path, dest_path, basepath, previous_path))
+    build_timings = timings.collector()
+    if jobs <= 1:
+        _init_page_worker(template_path, basepath, assets=assets)
+        results = map(_generate_page_task, tasks)
+    else:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        cache = inline_cache.current()
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker_process,
+                                       initargs=(template_path, basepath,
+                                                 build_timings is not None, assets,
+                                                 report.level(),
+                                                 cache.maxsize if cache is not None else None))
+        with executor:
+            results = list(executor.map(_generate_page_task, tasks, chunksize=chunksize))
+
+    failures = []
+    cache = inline_cache.current()
+    for (from_path, _), (log, error, page_timings, stats, inline_stats,
+                         cache_stats) in zip(pages, results):
+        staging.output_stats.merge(stats)
+        split_nodes.inline_stats.merge(inline_stats)
+        if cache is not None:
+            cache.stats.merge(cache_stats)
+        if log:
+            report.detail(log.rstrip("\n"))
+        if jobs > 1:
+            # Pages generated in this process were counted by generate_page
+            report.advance("pages")
+        if error is not None:
+            failures.append((from_path, error))
+        if build_timings is not None:
+            build_timings.pages.extend(page_timings)
+
+    if failures:
+        raise PageGenerationError(failures)
+
+
+# Template compiled once per worker process by _init_page_worker
+_worker_template = None
+# Fingerprinted asset names shared by every page of the build
+_worker_assets = None
+
+
+def _init_page_worker(template_path, basepath, collect_timings=False, assets=None):
+    global _worker_template, _worker_assets
+    _worker_template = PageTemplate.from_file(template_path, UrlResolver(basepath, assets))
+    _worker_assets = assets
+    if collect_timings:
+        timings.enable()
+
+
+def _init_worker_process(template_path, basepath, collect_timings, assets, report_level,
+                         inline_cache_size):
+    # A forked worker starts with a copy of the parent's write counts, which
+    # the parent already holds; count this process's writes from zero
+    staging.take_output_stats()
+    split_nodes.take_inline_stats()
+    report.configure(report_level)
+    if inline_cache_size is not None:
+        inline_cache.enable(inline_cache_size)
+    _init_page_worker(template_path, basepath, collect_timings, assets)
+
+
+def _generate_page_task(task):
+    """Run generate_page in a worker, returning its captured log, any error, timings and counts."""
+    import contextlib
+    import io
+
+    log = io.StringIO()
+    error = None
+    try:
+        with contextlib.redirect_stdout(log):
+            from_path, template_path, dest_path, basepath, previous_path = task
+            generate_page(from_path, template_path, dest_path, basepath, _worker_template,
+                          previous_path, _worker_assets)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    build_timings = timings.collector()
+    page_timings = build_timings.take_pages() if build_timings is not None else []
+    return (log.getvalue(), error, page_timings, staging.take_output_stats(),
+            split_nodes.take_inline_stats(), inline_cache.take_stats())
@@ -0,0 +1,137 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import hash_file
+from tree_walker import walk_tree
+
+
+# Text outputs worth serving pre-compressed
+COMPRESSIBLE_PATTERNS = ("*.html", "*.css", "*.js")
+
+# Files smaller than this gain too little from compression to be worth a sibling
+MIN_SIZE = 1024
+
+
+class PrecompressStats:
+    """Count .gz siblings that were compressed, reused from the previous build or skipped."""
+
+    def __init__(self):
+        self.compressed = 0
+        self.reused = 0
+        self.skipped = 0
+
+    def __repr__(self):
+        return (f"PrecompressStats(compressed: {self.compressed}, reused: {self.reused}, "
+                f"skipped: {self.skipped})")
+
+
+def precompress_outputs(dest_dir, previous_dir=None, previous_hashes=None, jobs=1,
+                        min_size=MIN_SIZE):
+    """
+    Write a gzip sibling (index.html -> index.html.gz) next to every text output.
+
+    Siblings are compressed at the highest level with a zero timestamp, so
+    the same input always gives the same bytes. Files below min_size, and
+    files that do not get smaller, are left without one. A file whose hash
+    matches previous_hashes reuses the previous build's sibling instead of
+    compressing it again: it is hardlinked from previous_dir, or left alone
+    when dest_dir is updated in place. Siblings of outputs that no longer
+    qualify are removed.
+
+    Compression runs on a thread pool; zlib releases the GIL while it works.
+
+    Args:
+        dest_dir: Output directory to compress
+        previous_dir: Output of the previous build, or None when dest_dir
+            is the previous output being updated in place
+        previous_hashes: {relative path: hash} of the files compressed by
+            the previous build, as returned by this function
+        jobs: Number of threads (0 means one per CPU core)
+        min_size: Smallest file size, in bytes, that gets a sibling
+
+    Returns:
+        Tuple (hashes, stats): {relative path: hash} of the files that now
+        have a sibling, and a PrecompressStats
+    """
+    previous_hashes = previous_hashes or {}
+    reuse_dir = previous_dir if previous_dir is not None else dest_dir
+
+    # Hidden files and editor leftovers are skipped, as in every other stage
+    rel_paths = sorted(rel_path
+                       for rel_path, entry in walk_tree(dest_dir, include=COMPRESSIBLE_PATTERNS)
+                       if not entry.is_dir())
+
+    def compress(rel_path):
+        return _precompress_file(dest_dir, reuse_dir, rel_path, previous_hashes.get(rel_path),
+                                 min_size)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        results = list(executor.map(compress, rel_paths))
+
+    hashes = {}
+    stats = PrecompressStats()
+    for rel_path, (outcome, digest) in zip(rel_paths, results):
+        setattr(stats, outcome, getattr(stats, outcome) + 1)
+        if digest is not None:
+            hashes[rel_path] = digest
+
+    # Siblings we wrote for outputs that have since disappeared
+    if previous_dir is None:
+        remove_siblings(dest_dir, [rel_path for rel_path in previous_hashes
+                                   if rel_path not in hashes])
+
+    return hashes, stats
+
+
+def remove_siblings(dest_dir, rel_paths):
+    """Delete the .gz siblings of the given outputs, e.g. once precompression is turned off."""
+    for rel_path in rel_paths:
+        _remove_if_exists(os.path.join(dest_dir, rel_path) + ".gz")
+
+
+def _precompress_file(dest_dir, reuse_dir, rel_path, previous_hash, min_size):
+    """Bring one file's .gz sibling up to date; returns (outcome, hash or None)."""
+    path = os.path.join(dest_dir, rel_path)
+    gz_path = path + ".gz"
+
+    if os.path.getsize(path) < min_size:
+        _remove_if_exists(gz_path)
+        return "skipped", None
+
+    digest = hash_file(path)
+    if digest == previous_hash:
+        previous_gz_path = os.path.join(reuse_dir, rel_path) + ".gz"
+        if previous_gz_path == gz_path and os.path.isfile(gz_path):
+            return "reused", digest
+        if os.path.isfile(previous_gz_path) and _try_link(previous_gz_path, gz_path):
+            return "reused", digest
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) >= len(data):
+        _remove_if_exists(gz_path)
+        return "skipped", None
+
+    temp_path = gz_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(compressed)
+    os.replace(temp_path, gz_path)
+    return "compressed", digest
+
+
+def _try_link(previous_path, dest_path):
+    _remove_if_exists(dest_path)
+    try:
+        os.link(previous_path, dest_path)
+    except OSError:
+        return False
+    return True
+
+
+def _remove_if_exists(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
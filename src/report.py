@@ -0,0 +1,132 @@
+import sys
+import threading
+import time
+
+
+# Output levels, from least to most talkative
+QUIET = 0
+NORMAL = 1
+VERBOSE = 2
+
+# Seconds between two redraws of the progress line
+PROGRESS_INTERVAL = 0.1
+
+
+class Reporter:
+    """
+    Central place for build output.
+
+    Summary lines are printed at NORMAL and above, per-file lines only at
+    VERBOSE. Per-file work is also counted into a single progress line
+    that is redrawn at most every PROGRESS_INTERVAL seconds, and only on a
+    terminal. Warnings are collected and printed together by finish(), so
+    they are not buried between thousands of file lines.
+    """
+
+    def __init__(self, level=NORMAL, stream=None):
+        self.level = level
+        # None means whatever sys.stdout is at the time of writing
+        self._stream = stream
+        self.counts = {}
+        self.warnings = []
+        self._lock = threading.Lock()
+        self._last_draw = 0.0
+        self._progress_shown = False
+
+    @property
+    def stream(self):
+        return self._stream if self._stream is not None else sys.stdout
+
+    def info(self, message):
+        """Print a summary line (NORMAL and VERBOSE)."""
+        if self.level >= NORMAL:
+            self._write_line(message)
+
+    def detail(self, message):
+        """Print a per-file line (VERBOSE only)."""
+        if self.level >= VERBOSE:
+            self._write_line(message)
+
+    def warning(self, message):
+        """Record a warning to be printed by finish()."""
+        with self._lock:
+            self.warnings.append(message)
+
+    def advance(self, label, count=1):
+        """Count finished work, e.g. advance("pages"), and redraw the progress line."""
+        with self._lock:
+            self.counts[label] = self.counts.get(label, 0) + count
+            if self.level != NORMAL or not self._is_terminal():
+                return
+            now = time.monotonic()
+            if now - self._last_draw < PROGRESS_INTERVAL:
+                return
+            self._last_draw = now
+            progress = ", ".join(f"{value} {name}" for name, value in self.counts.items())
+            self.stream.write(f"\r\x1b[K{progress}")
+            self.stream.flush()
+            self._progress_shown = True
+
+    def finish(self):
+        """Clear the progress line, print the collected warnings and reset the counts."""
+        with self._lock:
+            self._clear_progress()
+            warnings, self.warnings = self.warnings, []
+            self.counts = {}
+        if warnings:
+            print(f"{len(warnings)} warning(s):", file=sys.stderr)
+            for message in warnings:
+                print(f"  {message}", file=sys.stderr)
+
+    def _write_line(self, message):
+        with self._lock:
+            self._clear_progress()
+            print(message, file=self.stream)
+
+    def _clear_progress(self):
+        if self._progress_shown:
+            self.stream.write("\r\x1b[K")
+            self._progress_shown = False
+
+    def _is_terminal(self):
+        isatty = getattr(self.stream, "isatty", None)
+        return isatty is not None and isatty()
+
+
+# Reporter of this process; worker processes get the parent's level
+_reporter = Reporter()
+
+
+def configure(level):
+    """Replace the reporter with a fresh one at the given level and return it."""
+    global _reporter
+    _reporter = Reporter(level)
+    return _reporter
+
+
+def reporter():
+    return _reporter
+
+
+def level():
+    return _reporter.level
+
+
+def info(message):
+    _reporter.info(message)
+
+
+def detail(message):
+    _reporter.detail(message)
+
+
+def warning(message):
+    _reporter.warning(message)
+
+
+def advance(label, count=1):
+    _reporter.advance(label, count)
+
+
+def finish():
+    _reporter.finish()
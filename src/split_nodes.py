@@ -1,5 +1,61 @@
+import re
+
+import inline_cache
 from textnode import TextNode, TextType
-from markdown_extractor import extract_markdown_images, extract_markdown_links
+from markdown_extractor import IMAGE_PATTERN, LINK_PATTERN, extract_markdown_images_and_links
+
+
+# Inline delimiters, "**" first so it is never read as two "*"
+DELIMITER_PATTERN = re.compile(r"\*\*|[*_`]")
+
+# A complete delimited span: the enclosed text runs up to the closing
+# delimiter and contains no delimiter that is split before it (see
+# DELIMITER_ORDER). The last alternative matches a delimiter that opens no
+# complete span, which always means the text is invalid.
+SPAN_PATTERN = re.compile(
+    r"\*\*(.*?)\*\*"
+    r"|\*(?!\*)([^*]*)\*(?!\*)"
+    r"|_([^*_]*)_"
+    r"|`([^*_`]*)`"
+    r"|[*_`]",
+    re.DOTALL,
+)
+
+# SPAN_PATTERN group -> type of the enclosed text
+SPAN_TYPES = (None, TextType.BOLD, TextType.ITALIC, TextType.ITALIC, TextType.CODE)
+
+# Kind reported by extract_markdown_images_and_links -> node type
+LINK_KINDS = {"image": TextType.IMAGE, "link": TextType.LINK}
+
+class InlineStats:
+    """Count inline texts returned by the plain-text fast path and ones that had markup."""
+
+    def __init__(self):
+        self.plain = 0
+        self.markup = 0
+
+    def merge(self, other):
+        self.plain += other.plain
+        self.markup += other.markup
+
+    def __repr__(self):
+        return f"InlineStats(plain: {self.plain}, markup: {self.markup})"
+
+
+# Counts for the current process; worker processes hand theirs back with take_inline_stats
+inline_stats = InlineStats()
+
+
+def take_inline_stats():
+    """Return the counts recorded so far and start counting from zero."""
+    global inline_stats
+    stats, inline_stats = inline_stats, InlineStats()
+    return stats
+
+# The order in which the delimiters are split: text inside a span is not
+# looked at again, and a delimiter that comes earlier ends any open span of
+# one that comes later
+DELIMITER_ORDER = ("**", "*", "_", "`")
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -55,43 +111,7 @@ def split_nodes_image(old_nodes):
     Returns:
         List of TextNode objects with images converted to IMAGE type nodes
     """
-    new_nodes = []
-    
-    for old_node in old_nodes:
-        # Only split TEXT type nodes, leave others as-is
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        
-        current_text = old_node.text
-        images = extract_markdown_images(current_text)
-        
-        # If no images found, add the original node
-        if not images:
-            new_nodes.append(old_node)
-            continue
-        
-        # Process each image found
-        for image_alt, image_url in images:
-            # Split on the current image markdown
-            image_markdown = f"![{image_alt}]({image_url})"
-            sections = current_text.split(image_markdown, 1)
-            
-            # Add text before the image (if not empty)
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            
-            # Add the image node
-            new_nodes.append(TextNode(image_alt, TextType.IMAGE, image_url))
-            
-            # Continue with the remaining text
-            current_text = sections[1] if len(sections) > 1 else ""
-        
-        # Add any remaining text after the last image (if not empty)
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
-    
-    return new_nodes
+    return _split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 
 def split_nodes_link(old_nodes):
@@ -104,6 +124,24 @@ def split_nodes_link(old_nodes):
     Returns:
         List of TextNode objects with links converted to LINK type nodes
     """
+    return _split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+
+def _split_nodes_pattern(old_nodes, pattern, text_type):
+    """
+    Split text nodes at the matches of pattern, in one pass over each node.
+    
+    The text around the matches is sliced out by match position, so the
+    rest of a node is not searched and copied again for every match.
+    
+    Args:
+        old_nodes: List of TextNode objects
+        pattern: Compiled regex whose groups 1 and 2 are the text and the URL
+        text_type: TextType of the nodes made from the matches
+    
+    Returns:
+        List of TextNode objects
+    """
     new_nodes = []
     
     for old_node in old_nodes:
@@ -112,33 +150,23 @@ def split_nodes_link(old_nodes):
             new_nodes.append(old_node)
             continue
         
-        current_text = old_node.text
-        links = extract_markdown_links(current_text)
+        text = old_node.text
+        text_start = 0
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            # Add text before the match (if not empty)
+            if start > text_start:
+                new_nodes.append(TextNode(text[text_start:start], TextType.TEXT))
+            label, url = match.groups()
+            new_nodes.append(TextNode(label, text_type, url))
+            text_start = end
         
-        # If no links found, add the original node
-        if not links:
+        if text_start == 0:
+            # Nothing found, keep the original node
             new_nodes.append(old_node)
-            continue
-        
-        # Process each link found
-        for link_text, link_url in links:
-            # Split on the current link markdown
-            link_markdown = f"[{link_text}]({link_url})"
-            sections = current_text.split(link_markdown, 1)
-            
-            # Add text before the link (if not empty)
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            
-            # Add the link node
-            new_nodes.append(TextNode(link_text, TextType.LINK, link_url))
-            
-            # Continue with the remaining text
-            current_text = sections[1] if len(sections) > 1 else ""
-        
-        # Add any remaining text after the last link (if not empty)
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
+        elif text_start < len(text):
+            # Add any remaining text after the last match
+            new_nodes.append(TextNode(text[text_start:], TextType.TEXT))
     
     return new_nodes
 
@@ -147,28 +175,111 @@ def text_to_textnodes(text):
     """
     Convert a raw markdown text string into a list of TextNode objects.
     
-    This function applies all the splitting operations in sequence:
-    1. Split by bold delimiters (**)
-    2. Split by italic delimiters (*)
-    3. Split by code delimiters (`)
-    4. Split by images
-    5. Split by links
+    The text is tokenized in one left-to-right scan: each match of
+    SPAN_PATTERN is a complete bold, italic or code span, and images and
+    links are picked out of the plain text between them. The result is the
+    same as applying split_nodes_delimiter for each delimiter in
+    DELIMITER_ORDER, then split_nodes_image and split_nodes_link: text
+    inside a span is kept as is, so "**bold and *italic* inside**" is a
+    single bold node.
+    
+    Text without any of the characters all markup needs (*, _, ` and [)
+    is returned as a single text node without being scanned further.
+    While inline_cache is enabled, other results are cached by text; each
+    call still gets its own TextNode objects.
     
     Args:
         text: Raw markdown text string
     
     Returns:
         List of TextNode objects representing the parsed markdown
+    
+    Raises:
+        ValueError: If a delimiter is left unmatched
     """
-    # Start with a single TEXT node containing the entire text
-    nodes = [TextNode(text, TextType.TEXT)]
+    # An image needs a "[" too, so "!" does not have to be checked; a chain
+    # of "in" tests is much cheaper than a regex or any() for short texts
+    if "*" not in text and "_" not in text and "`" not in text and "[" not in text:
+        inline_stats.plain += 1
+        return [TextNode(text, TextType.TEXT)] if text else []
+    inline_stats.markup += 1
     
-    # Apply all splitting operations in sequence
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)  # Handle underscore italic
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    cache = inline_cache.current()
+    if cache is None:
+        return _parse_inline(text)
+    
+    cached = cache.get(text)
+    if cached is not None:
+        return [TextNode(*fields) for fields in cached]
+    nodes = _parse_inline(text)
+    cache.put(text, tuple((node.text, node.text_type, node.url) for node in nodes))
+    return nodes
+
+
+def _parse_inline(text):
+    """Tokenize inline markdown as described in text_to_textnodes."""
+    nodes = []
+    text_start = 0
+    for match in SPAN_PATTERN.finditer(text):
+        group = match.lastindex
+        if group is None:
+            _raise_unmatched_delimiter(text)
+        start = match.start()
+        if start > text_start:
+            _append_text(text[text_start:start], nodes)
+        content = match.group(group)
+        if content:
+            nodes.append(TextNode(content, SPAN_TYPES[group]))
+        text_start = match.end()
     
+    if text_start < len(text):
+        _append_text(text[text_start:], nodes)
     return nodes
+
+
+def _raise_unmatched_delimiter(text):
+    """
+    Raise the ValueError that split_nodes_delimiter would raise for text.
+    
+    Several delimiters may be unmatched; the error names the one whose
+    split pass comes first in DELIMITER_ORDER.
+    """
+    # Rank of the earliest split pass that finds an unmatched delimiter
+    error_rank = None
+    # (delimiter, rank) of the open span
+    open_span = None
+    for match in DELIMITER_PATTERN.finditer(text):
+        delimiter = match.group()
+        rank = DELIMITER_ORDER.index(delimiter)
+        if open_span is not None:
+            open_delimiter, open_rank = open_span
+            if delimiter == open_delimiter:
+                open_span = None
+                continue
+            if rank > open_rank:
+                # Part of the enclosed text
+                continue
+            # A delimiter that is split earlier cuts the open span short
+            if error_rank is None or open_rank < error_rank:
+                error_rank = open_rank
+        open_span = (delimiter, rank)
+    if open_span is not None and (error_rank is None or open_span[1] < error_rank):
+        error_rank = open_span[1]
+    
+    delimiter = DELIMITER_ORDER[error_rank]
+    raise ValueError(f"Invalid markdown syntax: unmatched delimiter '{delimiter}'")
+
+
+def _append_text(text, nodes):
+    """Append plain text to nodes, split around any images and links in it."""
+    if '[' not in text:
+        nodes.append(TextNode(text, TextType.TEXT))
+        return
+    text_start = 0
+    for kind, label, url, start, end in extract_markdown_images_and_links(text):
+        if start > text_start:
+            nodes.append(TextNode(text[text_start:start], TextType.TEXT))
+        nodes.append(TextNode(label, LINK_KINDS[kind], url))
+        text_start = end
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
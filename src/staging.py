@@ -0,0 +1,261 @@
+import filecmp
+import os
+import shutil
+import stat
+import threading
+
+from fastcopy import copy_file
+
+
+def staging_dir_for(output_dir):
+    """Return the staging directory used while building output_dir."""
+    return os.path.normpath(output_dir) + ".staging"
+
+
+def prepare_staging_dir(output_dir):
+    """
+    Get a fresh staging directory next to output_dir.
+
+    The staging directory lives on the same filesystem as the output so it
+    can be renamed into place and hardlinks to the previous output work.
+    Leftovers from an interrupted build are removed. The directory itself is
+    not created; the static copy step creates it.
+
+    Returns:
+        Path of the staging directory
+    """
+    staging_dir = staging_dir_for(output_dir)
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+    return staging_dir
+
+
+def discard_staging_dir(staging_dir):
+    """Remove a staging directory after a failed build."""
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def swap_in(staging_dir, output_dir):
+    """
+    Publish a finished staging directory as the new output directory.
+
+    The old output is renamed aside and the staging directory renamed into
+    its place, so the output path only goes missing for the instant between
+    two renames instead of for the whole build. The old output is deleted
+    afterwards.
+
+    Args:
+        staging_dir: Finished staging directory
+        output_dir: Directory being published
+    """
+    old_dir = os.path.normpath(output_dir) + ".old"
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+
+    if os.path.exists(output_dir):
+        os.rename(output_dir, old_dir)
+    os.rename(staging_dir, output_dir)
+
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+
+
+class OutputStats:
+    """Count output files that were written and ones skipped because they were unchanged."""
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+
+    def record(self, skipped):
+        if skipped:
+            self.skipped += 1
+        else:
+            self.written += 1
+
+    def merge(self, other):
+        self.written += other.written
+        self.skipped += other.skipped
+
+    def __repr__(self):
+        return f"OutputStats(written: {self.written}, skipped: {self.skipped})"
+
+
+# Counts for the current process; worker processes hand theirs back with take_output_stats
+output_stats = OutputStats()
+# Static files may be copied from several threads at once
+_output_stats_lock = threading.Lock()
+
+
+def take_output_stats():
+    """Return the counts recorded so far and start counting from zero."""
+    global output_stats
+    with _output_stats_lock:
+        stats, output_stats = output_stats, OutputStats()
+    return stats
+
+
+def _record(skipped):
+    with _output_stats_lock:
+        output_stats.record(skipped)
+
+
+class OutputFile:
+    """
+    Text sink that replaces dest_path only if what is written differs from it.
+
+    Text is encoded and compared with the existing output as it arrives:
+    previous_path when building into a staging directory, dest_path itself
+    when updating the output in place. While it matches, nothing is
+    written. At the first difference a temporary file is created next to
+    dest_path, starting with the matching bytes copied from the existing
+    file, and everything after goes there; on close it is renamed over
+    dest_path, so readers never see a half written file. An unchanged page
+    is therefore only read, never written: an identical previous output is
+    hardlinked and an identical destination is left alone, so its mtime
+    does not change.
+
+    Use it as a context manager; the file is published when the block ends
+    and discarded if it raises.
+
+    Args:
+        dest_path: Final path of the file
+        previous_path: Same file in the previous output, if any
+    """
+
+    def __init__(self, dest_path, previous_path=None):
+        self.dest_path = dest_path
+        self.previous_path = previous_path
+        self._temp_path = dest_path + ".tmp"
+        self._temp = None
+        # Number of leading bytes known to match the existing file
+        self._matched = 0
+        existing_path = previous_path if previous_path is not None else dest_path
+        self._existing_path = existing_path
+        self._existing = None
+        if os.path.isfile(existing_path):
+            try:
+                self._existing = open(existing_path, "rb")
+            except OSError:
+                pass
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        if self._temp is None:
+            if self._existing is not None and self._existing.read(len(data)) == data:
+                self._matched += len(data)
+                return
+            self._start_temp()
+        self._temp.write(data)
+
+    def close(self):
+        """
+        Publish what was written.
+
+        Returns:
+            True if writing was skipped because the output was unchanged
+        """
+        if self._temp is None:
+            # Unchanged only if the existing file has no bytes left over
+            if self._existing is not None and not self._existing.read(1):
+                if self._existing_path == self.dest_path or _try_link(self.previous_path,
+                                                                        self.dest_path):
+                    self._existing.close()
+                    _record(skipped=True)
+                    return True
+            self._start_temp()
+        self._temp.close()
+        os.replace(self._temp_path, self.dest_path)
+        _record(skipped=False)
+        return False
+
+    def discard(self):
+        """Drop what was written, leaving the existing output alone."""
+        if self._existing is not None:
+            self._existing.close()
+        if self._temp is not None:
+            self._temp.close()
+            os.remove(self._temp_path)
+
+    def _start_temp(self):
+        self._temp = open(self._temp_path, "wb")
+        if self._existing is not None:
+            self._existing.seek(0)
+            _copy_prefix(self._existing, self._temp, self._matched)
+            self._existing.close()
+            self._existing = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def copy_or_link(source_path, dest_path, previous_path=None, checksum=False, strategy="auto"):
+    """
+    Copy source_path to dest_path unless an identical file is already there.
+
+    Like OutputFile, an identical previous output is hardlinked and an
+    identical destination is left untouched. Copies keep the source's
+    modification time, so by default (as with rsync) files with the same
+    size and mtime count as identical without reading them; with checksum
+    the bytes are compared instead.
+
+    Args:
+        source_path: File to copy
+        dest_path: File to create or update
+        previous_path: Same file in the previous output, if any
+        checksum: Compare contents instead of size and mtime
+        strategy: Copy strategy passed to fastcopy.copy_file
+
+    Returns:
+        True if copying was skipped because the output was unchanged
+    """
+    existing_path = previous_path if previous_path is not None else dest_path
+    if _same_file(source_path, existing_path, checksum):
+        if existing_path == dest_path or _try_link(previous_path, dest_path):
+            _record(skipped=True)
+            return True
+
+    # Copy next to the destination and rename, so readers never see a
+    # partial file and a hardlinked destination is not written through
+    temp_path = dest_path + ".tmp"
+    if os.path.lexists(temp_path):
+        os.remove(temp_path)
+    copy_file(source_path, temp_path, strategy)
+    os.replace(temp_path, dest_path)
+    _record(skipped=False)
+    return False
+
+
+def _same_file(source_path, other_path, checksum):
+    try:
+        source_stat = os.stat(source_path)
+        other_stat = os.stat(other_path)
+    except OSError:
+        return False
+    if not stat.S_ISREG(other_stat.st_mode) or source_stat.st_size != other_stat.st_size:
+        return False
+    if checksum:
+        return filecmp.cmp(source_path, other_path, shallow=False)
+    return source_stat.st_mtime_ns == other_stat.st_mtime_ns
+
+
+def _copy_prefix(source, dest, size):
+    while size:
+        chunk = source.read(min(size, 1024 * 1024))
+        dest.write(chunk)
+        size -= len(chunk)
+
+
+def _try_link(previous_path, dest_path):
+    # Hardlinks fail across filesystems and on some network/FAT mounts
+    try:
+        os.link(previous_path, dest_path)
+    except OSError:
+        return False
+    return True
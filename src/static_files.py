@@ -1,58 +1,220 @@
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
+import report
+from staging import copy_or_link
+from tree_walker import walk_tree
 
-def copy_static_to_public(source_dir, dest_dir):
+
+class StaticCopyError(Exception):
+    """Raised after a parallel static copy finished and some files failed."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        lines = [f"{len(failures)} static file(s) failed to copy:"]
+        for source_path, error in failures:
+            lines.append(f"  {source_path}: {error}")
+        super().__init__("\n".join(lines))
+
+
+def copy_static_to_public(source_dir, dest_dir, previous_dir=None, sync=False, checksum=False,
+                          protect=(), strategy="auto", jobs=1, assets=None):
     """
     Recursively copy all contents from source directory to destination directory.
     First clears the destination directory to ensure a clean copy.
+
+    In sync mode the destination is updated in place instead, with rsync
+    semantics: only new or changed files are copied, and files and
+    directories that no longer exist in the source are removed.
     
     Args:
         source_dir: Path to the source directory
         dest_dir: Path to the destination directory
+        previous_dir: Optional previous output; files identical to the source
+            there are hardlinked instead of copied
+        sync: Update dest_dir in place instead of clearing it
+        checksum: Compare file contents instead of size and mtime
+        protect: Paths relative to dest_dir (with "/" separators) that sync
+            mode must not delete, such as generated pages
+        strategy: How files are copied; see fastcopy.STRATEGIES
+        jobs: Number of threads copying files (0 picks a default). The
+            tree is always walked and its directories created first; with
+            more than one job the files are then copied in parallel, and
+            still reported in walk order
+        assets: Optional map of asset paths relative to source_dir to the
+            fingerprinted paths they are written to instead
     """
-    print(f"Copying static files from {source_dir} to {dest_dir}")
+    report.info(f"Copying static files from {source_dir} to {dest_dir}")
+
+    if sync:
+        os.makedirs(dest_dir, exist_ok=True)
+        copies = _sync_directory_contents(source_dir, dest_dir, set(protect), assets)
+        _run_copies(copies, checksum, strategy, jobs, log_unchanged=False)
+        report.detail("Static file sync completed!")
+        return
     
     # Delete destination directory if it exists
     if os.path.exists(dest_dir):
-        print(f"Clearing destination directory: {dest_dir}")
+        report.detail(f"Clearing destination directory: {dest_dir}")
         shutil.rmtree(dest_dir)
     
     # Create the destination directory
-    print(f"Creating destination directory: {dest_dir}")
+    report.detail(f"Creating destination directory: {dest_dir}")
     os.mkdir(dest_dir)
     
-    # Recursively copy all contents
-    _copy_directory_contents(source_dir, dest_dir)
+    # Create the directory tree, then copy all files
+    copies = _plan_directory_contents(source_dir, dest_dir, previous_dir, assets)
+    _run_copies(copies, checksum, strategy, jobs)
     
-    print("Static file copy completed!")
+    report.detail("Static file copy completed!")
 
 
-def _copy_directory_contents(source_dir, dest_dir):
+def _plan_directory_contents(source_dir, dest_dir, previous_dir=None, assets=None):
     """
-    Recursively copy directory contents.
+    Create the destination directory tree and list the files to copy.
+    
+    The source tree is enumerated in one walk_tree pass. Directories are
+    created in walk order, parents before children, so the returned copies
+    can run in any order.
+    
+    Args:
+        source_dir: Path to the source directory
+        dest_dir: Path to the (existing) destination directory
+        previous_dir: Optional previous output to reuse unchanged files from
+        assets: Optional map of fingerprinted asset paths
+    
+    Returns:
+        List of (source_path, dest_path, previous_path) tuples in walk order
+    """
+    if not os.path.exists(source_dir):
+        report.warning(f"Source directory {source_dir} does not exist")
+        return []
+    
+    copies = []
+    for rel_path, entry in walk_tree(source_dir):
+        if entry.is_dir():
+            dest_path = os.path.join(dest_dir, rel_path)
+            report.detail(f"Creating directory: {dest_path}")
+            os.mkdir(dest_path)
+        else:
+            output_path = _output_path(rel_path, assets)
+            dest_path = os.path.join(dest_dir, output_path)
+            previous_path = os.path.join(previous_dir, output_path) if previous_dir else None
+            copies.append((entry.path, dest_path, previous_path))
+    return copies
+
+
+def _run_copies(copies, checksum, strategy, jobs, log_unchanged=True):
+    """
+    Copy files, on a thread pool when jobs is not 1, and report the results in order.
+    
+    A failing file does not stop the others; all failures are raised
+    together once every copy has finished.
+    
+    Args:
+        copies: List of (source_path, dest_path, previous_path) tuples
+        checksum: Compare file contents instead of size and mtime
+        strategy: How files are copied; see fastcopy.STRATEGIES
+        jobs: Number of threads (0 picks a default)
+        log_unchanged: Also list files that were left as they were
+    """
+    def copy(task):
+        source_path, dest_path, previous_path = task
+        try:
+            return copy_or_link(source_path, dest_path, previous_path, checksum, strategy), None
+        except Exception as e:
+            return None, e
+    
+    if jobs == 1:
+        results = map(copy, copies)
+    else:
+        with ThreadPoolExecutor(max_workers=jobs or None) as executor:
+            results = list(executor.map(copy, copies))
+    
+    failures = []
+    for (source_path, dest_path, _), (skipped, error) in zip(copies, results):
+        if error is not None:
+            report.detail(f"Error copying {source_path}: {error}")
+            failures.append((source_path, error))
+        elif not skipped:
+            report.detail(f"Copying file: {source_path} -> {dest_path}")
+        elif log_unchanged:
+            report.detail(f"Unchanged file: {source_path} -> {dest_path}")
+        report.advance("static files")
+    
+    if failures:
+        raise StaticCopyError(failures)
+
+
+def _sync_directory_contents(source_dir, dest_dir, protect, assets=None):
+    """
+    Make the directory tree of dest_dir mirror source_dir and list the files to copy.
+    
+    Directories are created, entries of the wrong type are replaced and
+    entries the source no longer has are removed; the files themselves
+    are left to the returned copies.
     
     Args:
         source_dir: Path to the source directory
         dest_dir: Path to the destination directory
+        protect: Set of relative output paths that must not be removed
+        assets: Optional map of fingerprinted asset paths
+    
+    Returns:
+        List of (source_path, dest_path, None) tuples in walk order
     """
     if not os.path.exists(source_dir):
-        print(f"Warning: Source directory {source_dir} does not exist")
-        return
+        report.warning(f"Source directory {source_dir} does not exist")
     
-    # List all items in the source directory
-    items = os.listdir(source_dir)
-    
-    for item in items:
-        source_path = os.path.join(source_dir, item)
-        dest_path = os.path.join(dest_dir, item)
-        
-        if os.path.isfile(source_path):
-            # Copy file
-            print(f"Copying file: {source_path} -> {dest_path}")
-            shutil.copy(source_path, dest_path)
+    copies = []
+    expected = set()
+    dirs = [""]
+    for rel_path, entry in walk_tree(source_dir):
+        if entry.is_dir():
+            output_path = rel_path
+            dest_path = os.path.join(dest_dir, rel_path)
+            # A file in the way of a directory is stale
+            if os.path.lexists(dest_path) and not os.path.isdir(dest_path):
+                os.remove(dest_path)
+            os.makedirs(dest_path, exist_ok=True)
+            dirs.append(rel_path + "/")
         else:
-            # Create directory and recursively copy its contents
-            print(f"Creating directory: {dest_path}")
-            os.mkdir(dest_path)
-            _copy_directory_contents(source_path, dest_path)
+            output_path = _output_path(rel_path, assets)
+            dest_path = os.path.join(dest_dir, output_path)
+            # And so is a directory in the way of a file
+            if os.path.isdir(dest_path) and not os.path.islink(dest_path):
+                shutil.rmtree(dest_path)
+            copies.append((entry.path, dest_path, None))
+        expected.add(output_path)
+    
+    # Remove whatever the source no longer has
+    for rel_dir in dirs:
+        dir_path = os.path.join(dest_dir, rel_dir)
+        for item in os.listdir(dir_path):
+            if rel_dir + item not in expected:
+                _remove_stale(os.path.join(dir_path, item), rel_dir + item, protect)
+    return copies
+
+
+def _output_path(rel_path, assets):
+    """Path a static file is written to: its fingerprinted path if it has one."""
+    if not assets:
+        return rel_path
+    return assets.get(rel_path, rel_path)
+
+
+def _remove_stale(path, rel_path, protect):
+    """Delete a stale file or directory tree, keeping protected paths."""
+    if rel_path in protect:
+        return
+    
+    if os.path.isdir(path) and not os.path.islink(path):
+        for item in os.listdir(path):
+            _remove_stale(os.path.join(path, item), f"{rel_path}/{item}", protect)
+        if not os.listdir(path):
+            os.rmdir(path)
+        return
+    
+    report.detail(f"Removing stale file: {path}")
+    os.remove(path)
@@ -0,0 +1,185 @@
+import contextlib
+import io
+import json
+import os
+import unittest
+
+from build import build_site
+from fixtures import TempDirMixin
+
+
+TEMPLATE = ('<html><title>{{ Title }}</title><link href="/index.css" />'
+            '<body>{{ Content }}</body></html>')
+
+
+class TestBuildSite(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.docs = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self._write(self.template, TEMPLATE)
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self._write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nBody")
+        self._write(os.path.join(self.static, "index.css"), "body {}")
+
+    def _read_output(self, *parts):
+        return self._read(os.path.join(self.docs, *parts))
+
+    def _build(self, incremental=True, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_site(self.content, self.static, self.template, self.docs,
+                       incremental=incremental, **kwargs)
+
+    def test_full_build_outputs(self):
+        self._build(incremental=False)
+        self.assertIn("<h1>Home</h1>", self._read_output("index.html"))
+        self.assertIn("<h1>Post</h1>", self._read_output("blog", "post.html"))
+        self.assertEqual(self._read_output("index.css"), "body {}")
+
+    def test_basepath_only_rewrites_urls(self):
+        self._write(os.path.join(self.content, "index.md"),
+                    "# Home\n\n[Post](/blog/post) and `href=\"/raw\"`")
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_site(self.content, self.static, self.template, self.docs, "/site/")
+        page = self._read_output("index.html")
+        self.assertIn('<a href="/site/blog/post">Post</a>', page)
+        self.assertIn('<code>href="/raw"</code>', page)
+
+    def test_full_build_reuses_unchanged_outputs(self):
+        self._build(incremental=False)
+        before = os.stat(os.path.join(self.docs, "blog", "post.html")).st_ino
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nEdited")
+        self._build(incremental=False)
+        after = os.stat(os.path.join(self.docs, "blog", "post.html")).st_ino
+        self.assertEqual(before, after)
+        self.assertIn("Edited", self._read_output("index.html"))
+        self.assertFalse(os.path.exists(self.docs + ".staging"))
+
+    def test_failed_full_build_keeps_previous_output(self):
+        self._build(incremental=False)
+        self._write(os.path.join(self.content, "broken.md"), "no title")
+        with self.assertRaises(Exception):
+            self._build(incremental=False)
+        self.assertIn("<h1>Home</h1>", self._read_output("index.html"))
+        self.assertFalse(os.path.exists(self.docs + ".staging"))
+
+    def test_incremental_only_regenerates_changed_pages(self):
+        self._build()
+        # Mark an unchanged output so we can tell whether it was rewritten
+        self._write(os.path.join(self.docs, "blog", "post.html"), "untouched")
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nEdited")
+        self._build()
+        self.assertIn("Edited", self._read_output("index.html"))
+        self.assertEqual(self._read_output("blog", "post.html"), "untouched")
+
+    def test_incremental_removes_outputs_of_deleted_sources(self):
+        self._build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        os.remove(os.path.join(self.static, "index.css"))
+        self._build()
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "index.css")))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+
+    def test_template_change_forces_full_rebuild(self):
+        self._build()
+        self._write(os.path.join(self.docs, "blog", "post.html"), "untouched")
+        self._write(self.template, "<main>{{ Title }}{{ Content }}</main>")
+        self._build()
+        self.assertTrue(self._read_output("blog", "post.html").startswith("<main>Post"))
+
+    def test_build_reports_written_and_skipped(self):
+        self._build(incremental=False)
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nEdited")
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            build_site(self.content, self.static, self.template, self.docs)
+        self.assertIn("Wrote 1 file(s), skipped 2 unchanged", log.getvalue())
+
+    def test_parallel_build_counts_each_write_once(self):
+        self._build(incremental=False, jobs=2)
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            build_site(self.content, self.static, self.template, self.docs, jobs=2)
+        self.assertIn("Wrote 0 file(s), skipped 3 unchanged", log.getvalue())
+
+    def test_incremental_skips_identical_page(self):
+        self._build()
+        path = os.path.join(self.docs, "index.html")
+        os.utime(path, ns=(0, 0))
+        # Trailing whitespace changes the source hash but not the HTML
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome\n\n")
+        self._build()
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+
+    def test_incremental_restores_deleted_outputs(self):
+        self._build()
+        os.remove(os.path.join(self.docs, "index.html"))
+        self._build()
+        self.assertIn("<h1>Home</h1>", self._read_output("index.html"))
+
+    def test_fingerprinted_assets_and_references(self):
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\n![Logo](/images/logo.png)")
+        self._write(os.path.join(self.static, "images", "logo.png"), "png")
+        self._build(fingerprint=True)
+        with open(os.path.join(self.docs, "asset-manifest.json")) as f:
+            assets = json.load(f)
+        self.assertEqual(sorted(assets), ["images/logo.png", "index.css"])
+        css, logo = assets["index.css"], assets["images/logo.png"]
+        self.assertRegex(css, r"^index\.[0-9a-f]{10}\.css$")
+        self.assertEqual(self._read_output(*css.split("/")), "body {}")
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "index.css")))
+        page = self._read_output("index.html")
+        self.assertIn(f'href="/{css}"', page)
+        self.assertIn(f'src="/{logo}"', page)
+
+    def test_fingerprint_keeps_well_known_names(self):
+        self._write(os.path.join(self.static, "robots.txt"), "User-agent: *")
+        self._write(os.path.join(self.static, "CNAME"), "example.com")
+        self._build(fingerprint=True)
+        self.assertEqual(self._read_output("robots.txt"), "User-agent: *")
+        self.assertEqual(self._read_output("CNAME"), "example.com")
+        with open(os.path.join(self.docs, "asset-manifest.json")) as f:
+            self.assertEqual(sorted(json.load(f)), ["index.css"])
+
+    def test_fingerprint_change_forces_full_rebuild(self):
+        self._build(fingerprint=True)
+        self._write(os.path.join(self.static, "index.css"), "body { color: red }")
+        self._build(fingerprint=True)
+        with open(os.path.join(self.docs, "asset-manifest.json")) as f:
+            css = json.load(f)["index.css"]
+        self.assertEqual(self._read_output(css), "body { color: red }")
+        # Pages link to the new name and the old file is gone
+        self.assertIn(f'href="/{css}"', self._read_output("blog", "post.html"))
+        self.assertEqual(len([name for name in os.listdir(self.docs) if name.endswith(".css")]), 1)
+
+    def test_incremental_fingerprint_build_keeps_fingerprinted_files(self):
+        self._build(fingerprint=True)
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nEdited")
+        self._build(fingerprint=True)
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "asset-manifest.json")))
+        self.assertEqual(len([name for name in os.listdir(self.docs) if name.endswith(".css")]), 1)
+        self.assertIn("Edited", self._read_output("index.html"))
+
+    def test_precompress_writes_and_cleans_up_siblings(self):
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\n" + "Welcome " * 300)
+        self._build(precompress=True)
+        gz_path = os.path.join(self.docs, "index.html.gz")
+        self.assertTrue(os.path.exists(gz_path))
+        # The small post gets no sibling
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "post.html.gz")))
+        os.remove(os.path.join(self.content, "index.md"))
+        self._build(precompress=True)
+        self.assertFalse(os.path.exists(gz_path))
+
+    def test_disabling_precompress_removes_siblings(self):
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\n" + "Welcome " * 300)
+        self._build(precompress=True)
+        self._build()
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "index.html.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import unittest
+
+import fastcopy
+from fastcopy import STRATEGIES, copy_file, format_strategy_counts, take_strategy_counts
+from fixtures import TempDirMixin
+
+
+class TestCopyFile(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = os.path.join(self.root, "source.bin")
+        with open(self.source, "wb") as f:
+            f.write(os.urandom(300 * 1024))
+        os.utime(self.source, ns=(10**18, 10**18))
+        take_strategy_counts()
+
+    def _check_copy(self, dest):
+        with open(self.source, "rb") as a, open(dest, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(os.stat(dest).st_mtime_ns, 10**18)
+
+    def test_every_strategy_copies_contents_and_mtime(self):
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                dest = os.path.join(self.root, f"{strategy}.bin")
+                used = copy_file(self.source, dest, strategy)
+                self.assertIn(used, STRATEGIES)
+                self._check_copy(dest)
+
+    def test_auto_never_hardlinks(self):
+        dest = os.path.join(self.root, "dest.bin")
+        self.assertNotEqual(copy_file(self.source, dest), "hardlink")
+        self.assertFalse(os.path.samefile(self.source, dest))
+        # Editing the source in place leaves the output alone
+        with open(self.source, "r+b") as f:
+            f.write(b"edited")
+        with open(dest, "rb") as f:
+            self.assertNotEqual(f.read(6), b"edited")
+
+    def test_hardlink_shares_source_edits(self):
+        dest = os.path.join(self.root, "dest.bin")
+        if copy_file(self.source, dest, "hardlink") != "hardlink":
+            self.skipTest("hardlinks unsupported here")
+        self.assertTrue(os.path.samefile(self.source, dest))
+        # Documented caveat: an in-place edit of the source reaches the output
+        with open(self.source, "r+b") as f:
+            f.write(b"edited")
+        with open(dest, "rb") as f:
+            self.assertEqual(f.read(6), b"edited")
+
+    def test_explicit_copy_does_not_share_inode(self):
+        dest = os.path.join(self.root, "dest.bin")
+        self.assertEqual(copy_file(self.source, dest, "copy"), "copy")
+        self.assertFalse(os.path.samefile(self.source, dest))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            copy_file(self.source, os.path.join(self.root, "x"), "teleport")
+
+    def test_strategy_counts(self):
+        copy_file(self.source, os.path.join(self.root, "a.bin"), "copy")
+        copy_file(self.source, os.path.join(self.root, "b.bin"), "copy")
+        counts = take_strategy_counts()
+        self.assertEqual(counts, {"copy": 2})
+        self.assertEqual(format_strategy_counts(counts), "copy: 2")
+        self.assertEqual(take_strategy_counts(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fingerprint import (
+    ASSET_MANIFEST_FILENAME,
+    fingerprint_assets,
+    fingerprinted_path,
+    save_asset_manifest,
+)
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_fingerprinted_path(self):
+        digest = "0123456789abcdef"
+        self.assertEqual(fingerprinted_path("index.css", digest), "index.0123456789.css")
+        self.assertEqual(fingerprinted_path("js/app.min.js", digest), "js/app.min.0123456789.js")
+        self.assertEqual(fingerprinted_path("LICENSE", digest), "LICENSE.0123456789")
+
+    def test_fingerprint_assets(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "css"))
+            for rel_path, text in (("css/a.css", "a"), ("b.css", "a"), ("page.html", "<p>"),
+                                   ("robots.txt", "User-agent: *"), ("CNAME", "example.com"),
+                                   ("favicon.ico", "icon")):
+                with open(os.path.join(root, rel_path), "w") as f:
+                    f.write(text)
+            assets = fingerprint_assets(root)
+        # HTML and well-known files keep their names; identical contents
+        # get the same hash
+        self.assertEqual(sorted(assets), ["b.css", "css/a.css"])
+        self.assertEqual(assets["css/a.css"], "css/" + assets["b.css"].replace("b.", "a.", 1))
+
+    def test_save_asset_manifest(self):
+        with tempfile.TemporaryDirectory() as root:
+            save_asset_manifest(root, {"index.css": "index.0123456789.css"})
+            with open(os.path.join(root, ASSET_MANIFEST_FILENAME)) as f:
+                self.assertEqual(json.load(f), {"index.css": "index.0123456789.css"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+import io
+
+from htmlnode import ChunkedWriter, HTMLNode, LeafNode, ParentNode
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -140,5 +142,53 @@ class TestParentNode(unittest.TestCase):
         self.assertEqual(div.to_html(), expected)
 
 
+class _RecordingSink:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+class TestWriteHtml(unittest.TestCase):
+    def _tree(self):
+        return ParentNode("div", [
+            ParentNode("p", [
+                LeafNode("b", "Bold"),
+                LeafNode(None, " text "),
+                LeafNode("a", "link", {"href": "/x"}),
+            ]),
+            LeafNode("img", "", {"src": "/i.png", "alt": "i"}),
+        ], {"class": "page"})
+
+    def test_write_html_matches_to_html(self):
+        node = self._tree()
+        sink = io.StringIO()
+        node.write_html(sink)
+        self.assertEqual(sink.getvalue(), node.to_html())
+
+    def test_write_html_validates_like_to_html(self):
+        with self.assertRaises(ValueError):
+            LeafNode("p", None).write_html(io.StringIO())
+        with self.assertRaises(ValueError):
+            ParentNode(None, []).write_html(io.StringIO())
+        with self.assertRaises(NotImplementedError):
+            HTMLNode().write_html(io.StringIO())
+
+    def test_chunked_writer_batches_small_fragments(self):
+        sink = _RecordingSink()
+        with ChunkedWriter(sink, chunk_size=10) as writer:
+            for _ in range(7):
+                writer.write("abc")
+        self.assertEqual(sink.writes, ["abc" * 4, "abc" * 3])
+
+    def test_chunked_writer_passes_big_fragments_through(self):
+        sink = _RecordingSink()
+        with ChunkedWriter(sink, chunk_size=4) as writer:
+            writer.write("ab")
+            writer.write("x" * 10)
+        self.assertEqual(sink.writes, ["ab", "x" * 10])
+
+
 if __name__ == "__main__":
     unittest.main()
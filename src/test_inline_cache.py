@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import unittest
+
+from fixtures import TempDirMixin
+import inline_cache
+from inline_cache import InlineCache
+from pagegen import collect_pages, generate_pages
+from split_nodes import text_to_textnodes
+from textnode import TextNode, TextType
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = InlineCache(maxsize=4)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", ())
+        self.assertEqual(cache.get("a"), ())
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_least_recently_used_entry_is_dropped(self):
+        cache = InlineCache(maxsize=2)
+        cache.put("a", (1,))
+        cache.put("b", (2,))
+        cache.get("a")
+        cache.put("c", (3,))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (1,))
+        self.assertEqual(cache.get("c"), (3,))
+
+    def test_take_stats_resets(self):
+        cache = InlineCache()
+        cache.get("a")
+        self.assertEqual(cache.take_stats().misses, 1)
+        self.assertEqual(cache.stats.misses, 0)
+
+    def test_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            InlineCache(maxsize=0)
+
+
+class TestCachedTextToTextNodes(unittest.TestCase):
+    def setUp(self):
+        self.cache = inline_cache.enable(maxsize=8)
+        self.addCleanup(inline_cache.disable)
+
+    def test_repeated_text_is_served_from_cache(self):
+        text = "A **bold** [link](/x)"
+        first = text_to_textnodes(text)
+        second = text_to_textnodes(text)
+        self.assertEqual(first, second)
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_callers_cannot_change_cached_result(self):
+        text = "plain *italic*"
+        nodes = text_to_textnodes(text)
+        nodes[0].text = "changed"
+        nodes.append(TextNode("extra", TextType.TEXT))
+        self.assertEqual(text_to_textnodes(text), [
+            TextNode("plain ", TextType.TEXT),
+            TextNode("italic", TextType.ITALIC),
+        ])
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                text_to_textnodes("unmatched `code")
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestInlineCacheAcrossWorkers(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(inline_cache.disable)
+        self.content = os.path.join(self.root, "content")
+        self.dest = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self._write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        for name in ("a", "b", "c", "d"):
+            self._write(os.path.join(self.content, f"{name}.md"),
+                        f"# {name}\n\n- [Home](/)\n- [About](/about)\n\nPage {name}\n")
+
+    def test_worker_counts_are_merged(self):
+        pages = collect_pages(self.content, self.dest)
+        counts = {}
+        for jobs in (1, 2):
+            cache = inline_cache.enable()
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages(pages, self.template, jobs=jobs)
+            stats = cache.take_stats()
+            counts[jobs] = stats.hits + stats.misses
+        # Every inline text with markup is looked up once, whichever
+        # process parsed it; the title and "Page x" take the fast path
+        self.assertEqual(counts[1], 4 * 2)
+        self.assertEqual(counts[2], counts[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
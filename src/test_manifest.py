@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from manifest import (
+    GENERATOR_VERSION,
+    diff_hashes,
+    full_rebuild_reason,
+    hash_tree,
+    load_manifest,
+    new_manifest,
+    save_manifest,
+)
+
+
+class TestManifest(unittest.TestCase):
+    def test_hash_tree_relative_paths_and_suffix(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "blog"))
+            for rel_path in ("index.md", "blog/post.md", "notes.txt"):
+                with open(os.path.join(root, rel_path), "w") as f:
+                    f.write(rel_path)
+            hashes = hash_tree(root, suffix=".md")
+            self.assertEqual(sorted(hashes), ["blog/post.md", "index.md"])
+
+    def test_hash_tree_missing_dir(self):
+        self.assertEqual(hash_tree("/does/not/exist"), {})
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as root:
+            manifest = new_manifest("abc", "/")
+            manifest["pages"] = {"index.md": "123"}
+            save_manifest(root, manifest)
+            self.assertEqual(load_manifest(root), manifest)
+
+    def test_load_missing_manifest(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.assertIsNone(load_manifest(root))
+
+    def test_full_rebuild_reason(self):
+        manifest = new_manifest("abc", "/")
+        self.assertIsNone(full_rebuild_reason(manifest, "abc", "/"))
+        self.assertEqual(full_rebuild_reason(None, "abc", "/"), "no previous build manifest")
+        self.assertEqual(full_rebuild_reason(manifest, "def", "/"), "template changed")
+        self.assertEqual(full_rebuild_reason(manifest, "abc", "/site/"), "basepath changed")
+        self.assertEqual(full_rebuild_reason(manifest, "abc", "/", {"a.css": "a.1.css"}),
+                         "asset fingerprints changed")
+        manifest["version"] = GENERATOR_VERSION + "-old"
+        self.assertEqual(full_rebuild_reason(manifest, "abc", "/"), "generator version changed")
+
+    def test_diff_hashes(self):
+        old = {"a.md": "1", "b.md": "2", "c.md": "3"}
+        new = {"a.md": "1", "b.md": "changed", "d.md": "4"}
+        self.assertEqual(diff_hashes(old, new), (["b.md", "d.md"], ["c.md"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
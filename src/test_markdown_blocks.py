@@ -1,6 +1,11 @@
+import io
 import unittest
 
-from markdown_blocks import markdown_to_blocks, block_to_block_type, BlockType
+from markdown_blocks import (
+    markdown_to_blocks, block_to_block_type, parse_block, parse_blocks, iter_blocks,
+    Block,
+    BlockType,
+)
 
 
 class TestMarkdownToBlocks(unittest.TestCase):
@@ -169,6 +174,78 @@ With another line"""
         blocks = markdown_to_blocks(md)
         self.assertEqual(blocks, ["Block 1", "Block 2", "Block 3"])
 
+    def test_markdown_to_blocks_code_block_with_blank_lines(self):
+        md = "Intro\n\n```python\nx = 1\n\n\ny = 2\n```\n\nOutro"
+        self.assertEqual(
+            markdown_to_blocks(md),
+            ["Intro", "```python\nx = 1\n\n\ny = 2\n```", "Outro"],
+        )
+
+    def test_markdown_to_blocks_unclosed_fence_splits_at_blank_lines(self):
+        md = "```\nnever closed\n\nNext paragraph\n\n- item"
+        self.assertEqual(
+            markdown_to_blocks(md),
+            ["```\nnever closed", "Next paragraph", "- item"],
+        )
+
+    def test_markdown_to_blocks_whitespace_only_line_separates(self):
+        self.assertEqual(markdown_to_blocks("First\n  \t\nSecond"), ["First", "Second"])
+
+
+class TestParseBlocks(unittest.TestCase):
+    def test_blocks_and_types(self):
+        md = "  # Title  \n\n> quote\n> more\n\n1. one\n2. two\n\n```\ncode\n\nmore code\n```\n"
+        self.assertEqual(
+            [block.block_type for block in parse_blocks(md)],
+            [BlockType.HEADING, BlockType.QUOTE, BlockType.ORDERED_LIST, BlockType.CODE],
+        )
+        self.assertEqual(list(parse_blocks(md))[3].text, "code\n\nmore code")
+
+
+class TestParseBlock(unittest.TestCase):
+    def test_heading(self):
+        self.assertEqual(parse_block("### Some *title*"),
+                         Block(BlockType.HEADING, text="Some *title*", level=3))
+
+    def test_paragraph_joins_lines(self):
+        self.assertEqual(parse_block("one\ntwo"), Block(BlockType.PARAGRAPH, text="one two"))
+
+    def test_code_body(self):
+        self.assertEqual(parse_block("```python\nx = 1\n\ny = 2\n```"),
+                         Block(BlockType.CODE, text="x = 1\n\ny = 2"))
+        self.assertEqual(parse_block("```inline```"), Block(BlockType.CODE, text=""))
+
+    def test_quote_lines(self):
+        self.assertEqual(parse_block("> first\n>second"),
+                         Block(BlockType.QUOTE, text="first\nsecond"))
+
+    def test_list_items(self):
+        self.assertEqual(parse_block("- a\n- b"), Block(BlockType.UNORDERED_LIST, items=["a", "b"]))
+        self.assertEqual(parse_block("1. a\n2. b"), Block(BlockType.ORDERED_LIST, items=["a", "b"]))
+
+    def test_broken_markers_fall_back_to_paragraph(self):
+        for block in ("> a\nb", "- a\nb", "1. a\n3. b", "####### x", "#x"):
+            self.assertEqual(parse_block(block).block_type, BlockType.PARAGRAPH, block)
+
+
+class TestIterBlocks(unittest.TestCase):
+    def test_matches_parse_blocks(self):
+        md = ("  # Title\n\n\n> q\n>q\n \t\n```\ncode\n\n  \nmore\n```\nafter fence\n\n"
+              "- a\n- b\n\n1. x\n2. y")
+        self.assertEqual(list(iter_blocks(io.StringIO(md))), list(parse_blocks(md)))
+
+    def test_unclosed_fence_splits_at_blank_lines(self):
+        md = "intro\n\n```python\nx = 1\n\ny = 2\n"
+        self.assertEqual(list(iter_blocks(io.StringIO(md))), list(parse_blocks(md)))
+        self.assertEqual(len(list(iter_blocks(io.StringIO(md)))), 3)
+
+    def test_reads_lazily(self):
+        lines = iter(["# A\n", "\n", "para\n", "\n", "rest\n"])
+        blocks = iter_blocks(lines)
+        self.assertEqual(next(blocks), Block(BlockType.HEADING, text="A", level=1))
+        # Only the first block and its separator have been read
+        self.assertEqual(next(lines), "para\n")
+
 
 class TestBlockToBlockType(unittest.TestCase):
     def test_block_to_block_type_heading_h1(self):
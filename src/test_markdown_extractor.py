@@ -1,6 +1,8 @@
 import unittest
 
-from markdown_extractor import extract_markdown_images, extract_markdown_links
+from markdown_extractor import (
+    extract_markdown_images, extract_markdown_links, extract_markdown_images_and_links,
+)
 
 
 class TestMarkdownExtractor(unittest.TestCase):
@@ -119,6 +121,39 @@ class TestMarkdownExtractor(unittest.TestCase):
         image_matches = extract_markdown_images(text)
         self.assertListEqual([("local image", "../images/pic.jpg")], image_matches)
 
+    def test_extract_images_and_links_in_order(self):
+        text = "A [link](/a) then ![pic](/p.png) and [another](/b)"
+        matches = extract_markdown_images_and_links(text)
+        self.assertListEqual([
+            ("link", "link", "/a", 2, 12),
+            ("image", "pic", "/p.png", 18, 32),
+            ("link", "another", "/b", 37, 50),
+        ], matches)
+        for _, _, _, start, end in matches:
+            self.assertTrue(text[start:end].endswith(")"))
+
+    def test_extract_images_and_links_matches_separate_extractors(self):
+        text = ("![a](b)[c](d) x![e](f) [g](h(i)) [[j](k)] ![](l) [m]( n ) "
+                "!![o](p)")
+        matches = extract_markdown_images_and_links(text)
+        self.assertListEqual(
+            [(label, url) for kind, label, url, _, _ in matches if kind == "image"],
+            extract_markdown_images(text))
+        self.assertListEqual(
+            [(label, url) for kind, label, url, _, _ in matches if kind == "link"],
+            extract_markdown_links(text))
+
+
+    def test_extract_images_and_links_images_win_overlaps(self):
+        # The link "[a](![b)" overlaps the image "![b)](c)"; images are
+        # split out first, so only the image is found
+        self.assertListEqual(
+            extract_markdown_images_and_links("[a](![b)](c)"),
+            [("image", "b)", "c", 4, 12)])
+        self.assertListEqual(
+            extract_markdown_images_and_links("see [x](![y)](z) end [l](u)"),
+            [("image", "y)", "z", 8, 16), ("link", "l", "u", 21, 27)])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
+import io
 import unittest
 
-from markdown_to_html import markdown_to_html_node
+from htmlnode import ParentNode
+from markdown_to_html import markdown_to_html_node, iter_html_nodes
 
 
 class TestMarkdownToHTMLNode(unittest.TestCase):
@@ -36,6 +38,11 @@ the **same** even with inline stuff
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff</code></pre></div>",
         )
 
+    def test_codeblock_with_blank_lines(self):
+        md = "```\nfirst = 1\n\nsecond = **2**\n```"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, "<div><pre><code>first = 1\n\nsecond = **2**</code></pre></div>")
+
     def test_single_paragraph(self):
         md = "This is a simple paragraph with no formatting."
         node = markdown_to_html_node(md)
@@ -183,5 +190,21 @@ but should still be one paragraph."""
         self.assertEqual(html, expected)
 
 
+class TestIterHTMLNodes(unittest.TestCase):
+    def test_matches_markdown_to_html_node(self):
+        md = ("# Title\n\nSome **bold**\ntext\n\n```\ncode\n\nmore\n```\n\n"
+              "> quote\n\n- a\n- b\n\n1. one\n  \nafter\n")
+        sink = io.StringIO()
+        ParentNode("div", iter_html_nodes(io.StringIO(md))).write_html(sink)
+        self.assertEqual(sink.getvalue(), markdown_to_html_node(md).to_html())
+
+    def test_yields_one_node_per_block(self):
+        nodes = list(iter_html_nodes(io.StringIO("# A\n\npara\n")))
+        self.assertEqual([node.to_html() for node in nodes], ["<h1>A</h1>", "<p>para</p>"])
+
+    def test_empty_document(self):
+        self.assertEqual(list(iter_html_nodes(io.StringIO(""))), [])
+
+
 if __name__ == "__main__":
     unittest.main()
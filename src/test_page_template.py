@@ -0,0 +1,44 @@
+import io
+import unittest
+
+from page_template import PageTemplate
+
+
+class TestPageTemplate(unittest.TestCase):
+    def test_render_fills_slots(self):
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(
+            template.render("Hello", "<p>Hi</p>"),
+            "<title>Hello</title><body><p>Hi</p></body>",
+        )
+
+    def test_render_repeated_slot(self):
+        template = PageTemplate("{{ Title }}|{{ Title }}")
+        self.assertEqual(template.render("T", ""), "T|T")
+
+    def test_render_without_slots(self):
+        template = PageTemplate("<html></html>")
+        self.assertEqual(template.render("T", "C"), "<html></html>")
+
+    def test_slot_values_are_not_reparsed(self):
+        template = PageTemplate("{{ Title }}:{{ Content }}")
+        self.assertEqual(template.render("{{ Content }}", "x"), "{{ Content }}:x")
+
+    def test_unknown_placeholder_kept(self):
+        template = PageTemplate("{{ Other }}{{ Title }}")
+        self.assertEqual(template.render("T", "C"), "{{ Other }}T")
+
+    def test_template_is_reusable(self):
+        template = PageTemplate("<h1>{{ Title }}</h1>")
+        self.assertEqual(template.render("A", ""), "<h1>A</h1>")
+        self.assertEqual(template.render("B", ""), "<h1>B</h1>")
+
+    def test_write_streams_same_output_as_render(self):
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        sink = io.StringIO()
+        template.write(sink, "Hello", lambda out: out.write("<p>Hi</p>"))
+        self.assertEqual(sink.getvalue(), template.render("Hello", "<p>Hi</p>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
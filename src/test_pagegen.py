@@ -1,5 +1,12 @@
+import contextlib
+import io
+import os
 import unittest
-from pagegen import extract_title
+from fixtures import TempDirMixin
+from pagegen import (
+    extract_title, collect_pages, generate_pages, generate_pages_recursive, page_dest_path,
+    PageGenerationError,
+)
 
 class TestExtractTitle(unittest.TestCase):
     def test_simple(self):
@@ -22,5 +29,73 @@ bar
     def test_h1_with_extra_hashes(self):
         self.assertEqual(extract_title("# Title #"), "Title #")
 
+class TestGeneratePages(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.dest = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self._write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self._write(os.path.join(self.content, "index.md"), "# Home")
+        self._write(os.path.join(self.content, "blog", "a.md"), "# A")
+        self._write(os.path.join(self.content, "blog", "b.md"), "# B")
+
+    def test_collect_pages_sorted(self):
+        pages = collect_pages(self.content, self.dest)
+        self.assertEqual(pages, [
+            (os.path.join(self.content, "blog", "a.md"), os.path.join(self.dest, "blog", "a.html")),
+            (os.path.join(self.content, "blog", "b.md"), os.path.join(self.dest, "blog", "b.html")),
+            (os.path.join(self.content, "index.md"), os.path.join(self.dest, "index.html")),
+        ])
+
+    def test_dest_path_keeps_directory_names(self):
+        self.assertEqual(page_dest_path("notes.mdx/page.md"), "notes.mdx/page.html")
+        self._write(os.path.join(self.content, "notes.mdx", "page.md"), "# Page")
+        pages = collect_pages(self.content, self.dest)
+        self.assertIn((os.path.join(self.content, "notes.mdx", "page.md"),
+                       os.path.join(self.dest, "notes.mdx", "page.html")), pages)
+
+    def test_parallel_matches_serial(self):
+        pages = collect_pages(self.content, self.dest)
+        outputs = {}
+        for jobs in (1, 2):
+            log = io.StringIO()
+            with contextlib.redirect_stdout(log):
+                generate_pages(pages, self.template, jobs=jobs)
+            contents = []
+            for _, dest_path in pages:
+                contents.append(self._read(dest_path))
+            outputs[jobs] = (log.getvalue(), contents)
+        self.assertEqual(outputs[1], outputs[2])
+        self.assertIn("<title>A</title>", outputs[2][1][0])
+
+    def test_errors_are_aggregated(self):
+        self._write(os.path.join(self.content, "blog", "a.md"), "no title")
+        self._write(os.path.join(self.content, "blog", "b.md"), "no title either")
+        pages = collect_pages(self.content, self.dest)
+        # The default serial build reports failures like a parallel one
+        for jobs in (1, 2):
+            with contextlib.redirect_stdout(io.StringIO()):
+                with self.assertRaises(PageGenerationError) as context:
+                    generate_pages_recursive(self.content, self.template, self.dest, jobs=jobs)
+            self.assertEqual([path for path, _ in context.exception.failures],
+                             [pages[0][0], pages[1][0]])
+            # The healthy page is still generated
+            self.assertTrue(os.path.exists(pages[2][1]))
+            os.remove(pages[2][1])
+
+    def test_title_after_content_is_streamed_correctly(self):
+        self._write(os.path.join(self.content, "index.md"),
+                    "Intro\n\n```\n# not a block\n```\n\n# Late Title\n\nEnd\n")
+        pages = collect_pages(self.content, self.dest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(pages, self.template)
+        page = self._read(pages[2][1])
+        # extract_title matches lines anywhere, including inside code
+        self.assertEqual(page, "<title>not a block</title><div><p>Intro</p>"
+                               "<pre><code># not a block</code></pre><h1>Late Title</h1>"
+                               "<p>End</p></div>")
+
+
 if __name__ == "__main__":
     unittest.main()
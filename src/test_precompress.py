@@ -0,0 +1,88 @@
+import gzip
+import os
+import unittest
+
+from fixtures import TempDirMixin
+from precompress import precompress_outputs
+
+
+BIG_HTML = "<p>" + "hello world " * 200 + "</p>"
+
+
+class TestPrecompressOutputs(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dest = os.path.join(self.root, "docs")
+        self._write_output("index.html", BIG_HTML)
+        self._write_output("blog/post.html", BIG_HTML)
+        self._write_output("tiny.css", "a {}")
+        self._write_output("image.png", "png " * 1000)
+
+    def _write_output(self, rel_path, text, root=None):
+        self._write(os.path.join(root or self.dest, rel_path), text)
+
+    def _gz(self, rel_path, root=None):
+        return os.path.join(root or self.dest, rel_path) + ".gz"
+
+    def test_compresses_large_text_outputs_only(self):
+        hashes, stats = precompress_outputs(self.dest, jobs=2)
+        self.assertEqual(sorted(hashes), ["blog/post.html", "index.html"])
+        self.assertEqual((stats.compressed, stats.reused, stats.skipped), (2, 0, 1))
+        with gzip.open(self._gz("index.html"), "rt") as f:
+            self.assertEqual(f.read(), BIG_HTML)
+        self.assertFalse(os.path.exists(self._gz("tiny.css")))
+        self.assertFalse(os.path.exists(self._gz("image.png")))
+
+    def test_skips_hidden_and_editor_files(self):
+        self._write_output(".draft.html", BIG_HTML)
+        self._write_output("blog/post.html.swp", BIG_HTML)
+        self._write_output(".cache/page.html", BIG_HTML)
+        hashes, _ = precompress_outputs(self.dest)
+        self.assertEqual(sorted(hashes), ["blog/post.html", "index.html"])
+        self.assertFalse(os.path.exists(self._gz(".draft.html")))
+        self.assertFalse(os.path.exists(self._gz(".cache/page.html")))
+
+    def test_output_is_deterministic(self):
+        precompress_outputs(self.dest)
+        with open(self._gz("index.html"), "rb") as f:
+            first = f.read()
+        os.remove(self._gz("index.html"))
+        precompress_outputs(self.dest)
+        with open(self._gz("index.html"), "rb") as f:
+            self.assertEqual(f.read(), first)
+
+    def test_skips_files_that_do_not_shrink(self):
+        with open(os.path.join(self.dest, "random.js"), "wb") as f:
+            f.write(os.urandom(4096))
+        hashes, _ = precompress_outputs(self.dest, min_size=0)
+        self.assertNotIn("random.js", hashes)
+        self.assertFalse(os.path.exists(self._gz("random.js")))
+
+    def test_reuses_unchanged_siblings_in_place(self):
+        hashes, _ = precompress_outputs(self.dest)
+        os.utime(self._gz("index.html"), ns=(0, 0))
+        self._write_output("blog/post.html", BIG_HTML + "<p>edited</p>")
+        _, stats = precompress_outputs(self.dest, previous_hashes=hashes)
+        self.assertEqual((stats.compressed, stats.reused), (1, 1))
+        self.assertEqual(os.stat(self._gz("index.html")).st_mtime_ns, 0)
+        with gzip.open(self._gz("blog/post.html"), "rt") as f:
+            self.assertIn("edited", f.read())
+
+    def test_links_unchanged_siblings_from_previous_output(self):
+        hashes, _ = precompress_outputs(self.dest)
+        staging = os.path.join(self.root, "staging")
+        self._write_output("index.html", BIG_HTML, root=staging)
+        _, stats = precompress_outputs(staging, self.dest, hashes)
+        self.assertEqual(stats.reused, 1)
+        self.assertTrue(os.path.samefile(self._gz("index.html"), self._gz("index.html", staging)))
+
+    def test_removes_siblings_of_deleted_outputs(self):
+        hashes, _ = precompress_outputs(self.dest)
+        os.remove(os.path.join(self.dest, "blog", "post.html"))
+        hashes, _ = precompress_outputs(self.dest, previous_hashes=hashes)
+        self.assertEqual(sorted(hashes), ["index.html"])
+        self.assertFalse(os.path.exists(self._gz("blog/post.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
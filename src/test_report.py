@@ -0,0 +1,73 @@
+import contextlib
+import io
+import unittest
+
+import report
+from report import NORMAL, QUIET, VERBOSE, Reporter
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestReporter(unittest.TestCase):
+    def test_levels(self):
+        for level, expected in ((QUIET, ""), (NORMAL, "summary\n"),
+                                (VERBOSE, "summary\nper file\n")):
+            stream = io.StringIO()
+            reporter = Reporter(level, stream)
+            reporter.info("summary")
+            reporter.detail("per file")
+            self.assertEqual(stream.getvalue(), expected)
+
+    def test_default_stream_follows_stdout(self):
+        reporter = Reporter()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            reporter.info("hello")
+        self.assertEqual(output.getvalue(), "hello\n")
+
+    def test_warnings_are_printed_by_finish(self):
+        reporter = Reporter(QUIET, io.StringIO())
+        reporter.warning("first")
+        reporter.warning("second")
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            reporter.finish()
+            reporter.finish()
+        self.assertEqual(errors.getvalue(), "2 warning(s):\n  first\n  second\n")
+
+    def test_progress_only_on_terminal(self):
+        stream = io.StringIO()
+        reporter = Reporter(NORMAL, stream)
+        reporter.advance("pages")
+        self.assertEqual(reporter.counts, {"pages": 1})
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_progress_is_throttled_and_cleared(self):
+        stream = FakeTerminal()
+        reporter = Reporter(NORMAL, stream)
+        for _ in range(100):
+            reporter.advance("pages")
+        reporter.advance("static files", 3)
+        # Only the first update is drawn within one interval
+        self.assertEqual(stream.getvalue(), "\r\x1b[K1 pages")
+        reporter.info("done")
+        self.assertTrue(stream.getvalue().endswith("\r\x1b[Kdone\n"))
+        reporter.finish()
+        self.assertEqual(reporter.counts, {})
+
+    def test_module_functions_use_configured_reporter(self):
+        previous = report.reporter()
+        self.addCleanup(report.configure, previous.level)
+        report.configure(QUIET)
+        self.assertEqual(report.level(), QUIET)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report.info("hidden")
+        self.assertEqual(output.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 import unittest
 
 from textnode import TextNode, TextType
-from split_nodes import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+from split_nodes import (
+    split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes, take_inline_stats,
+)
 
 
 class TestSplitNodesDelimiter(unittest.TestCase):
@@ -396,6 +398,24 @@ class TestSplitNodesLink(unittest.TestCase):
         ]
         self.assertEqual(new_nodes, expected)
 
+    def test_split_links_image_with_same_markdown(self):
+        # The link is split where it was found, not at the first place its
+        # markdown occurs (inside the image)
+        node = TextNode("![a](b) then [a](b)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        expected = [
+            TextNode("![a](b) then ", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b"),
+        ]
+        self.assertEqual(new_nodes, expected)
+
+    def test_split_links_many_links(self):
+        text = " | ".join(f"[Page {i}](/p/{i}.html)" for i in range(2000))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 3999)
+        self.assertEqual(new_nodes[-1], TextNode("Page 1999", TextType.LINK, "/p/1999.html"))
+        self.assertEqual(new_nodes[-2], TextNode(" | ", TextType.TEXT))
+
     def test_split_links_complex_urls(self):
         node = TextNode(
             "Complex [search](https://www.google.com/search?q=python&oq=python) URL",
@@ -579,6 +599,70 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(nodes, expected)
 
+    def test_text_to_textnodes_delimiters_keep_split_order(self):
+        # Bold is split first, so the stars and backticks inside stay text,
+        # and the underscores in a URL still split it like they always did
+        text = "**a `b` c** and [x_y](u_v)"
+        nodes = text_to_textnodes(text)
+        expected = [
+            TextNode("a `b` c", TextType.BOLD),
+            TextNode(" and [x", TextType.TEXT),
+            TextNode("y](u", TextType.ITALIC),
+            TextNode("v)", TextType.TEXT),
+        ]
+        self.assertEqual(nodes, expected)
+
+    def test_text_to_textnodes_unmatched_delimiter(self):
+        # Reported for the delimiter whose split pass would find it first
+        for text, delimiter in (("`a*b", "*"), ("_a **b", "**"), ("*a**b*", "**"),
+                                ("_a `b", "_")):
+            with self.assertRaises(ValueError) as context:
+                text_to_textnodes(text)
+            self.assertIn(f"unmatched delimiter '{delimiter}'", str(context.exception), text)
+
+    def test_text_to_textnodes_image_overlapping_link(self):
+        self.assertEqual(text_to_textnodes("[a](![b)](c)"), [
+            TextNode("[a](", TextType.TEXT),
+            TextNode("b)", TextType.IMAGE, "c"),
+        ])
+
+    def test_text_to_textnodes_matches_sequential_splits(self):
+        delimiters = (("**", TextType.BOLD), ("*", TextType.ITALIC), ("_", TextType.ITALIC),
+                      ("`", TextType.CODE))
+        for text in ("***a**b*", "****", "a``b", "`x*y`", "*a_b_c*", "![i](p)_x_[l](u)",
+                     "_**_", "x\n*y\nz*", "[a](![b)](c)", "see [x](![y)](z) end",
+                     "[](![)]())]a"):
+            nodes = [TextNode(text, TextType.TEXT)]
+            try:
+                for delimiter, text_type in delimiters:
+                    nodes = split_nodes_delimiter(nodes, delimiter, text_type)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    text_to_textnodes(text)
+                continue
+            expected = split_nodes_link(split_nodes_image(nodes))
+            self.assertEqual(text_to_textnodes(text), expected, text)
+
+
+class TestPlainTextFastPath(unittest.TestCase):
+    def setUp(self):
+        take_inline_stats()
+
+    def test_plain_text_is_one_node(self):
+        self.assertEqual(text_to_textnodes("Wow! Plain (really) text."),
+                         [TextNode("Wow! Plain (really) text.", TextType.TEXT)])
+        self.assertEqual(text_to_textnodes(""), [])
+        stats = take_inline_stats()
+        self.assertEqual((stats.plain, stats.markup), (2, 0))
+
+    def test_markup_is_counted_and_parsed(self):
+        self.assertEqual(text_to_textnodes("a [b](c)"), [
+            TextNode("a ", TextType.TEXT),
+            TextNode("b", TextType.LINK, "c"),
+        ])
+        stats = take_inline_stats()
+        self.assertEqual((stats.plain, stats.markup), (0, 1))
+
 
 if __name__ == "__main__":
     unittest.main()
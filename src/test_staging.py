@@ -0,0 +1,139 @@
+import os
+import unittest
+
+from fixtures import TempDirMixin
+import staging
+from staging import OutputFile, copy_or_link, prepare_staging_dir, swap_in, take_output_stats
+
+
+class TestStaging(TempDirMixin, unittest.TestCase):
+    def test_prepare_removes_leftovers(self):
+        output = os.path.join(self.root, "docs")
+        self._write(os.path.join(output + ".staging", "stale.html"), "stale")
+        staging = prepare_staging_dir(output)
+        self.assertEqual(staging, output + ".staging")
+        self.assertFalse(os.path.exists(staging))
+
+    def test_swap_in_replaces_output(self):
+        output = os.path.join(self.root, "docs")
+        staging = output + ".staging"
+        self._write(os.path.join(output, "old.html"), "old")
+        self._write(os.path.join(staging, "new.html"), "new")
+        swap_in(staging, output)
+        self.assertEqual(os.listdir(output), ["new.html"])
+        self.assertFalse(os.path.exists(staging))
+        self.assertFalse(os.path.exists(output + ".old"))
+
+    def test_swap_in_without_previous_output(self):
+        output = os.path.join(self.root, "docs")
+        staging = output + ".staging"
+        self._write(os.path.join(staging, "new.html"), "new")
+        swap_in(staging, output)
+        self.assertEqual(self._read(os.path.join(output, "new.html")), "new")
+
+    def _output(self, dest, text, previous=None):
+        output = OutputFile(dest, previous)
+        # Written in pieces, as the page renderer does
+        for start in range(0, len(text), 3):
+            output.write(text[start:start + 3])
+        return output
+
+    def test_output_file_reuses_identical_file(self):
+        previous = os.path.join(self.root, "prev.html")
+        dest = os.path.join(self.root, "dest.html")
+        self._write(previous, "same contents")
+        output = self._output(dest, "same contents", previous)
+        self.assertFalse(os.path.exists(dest + ".tmp"))
+        self.assertTrue(output.close())
+        self.assertTrue(os.path.samefile(previous, dest))
+
+    def test_output_file_writes_changed_file(self):
+        previous = os.path.join(self.root, "prev.html")
+        dest = os.path.join(self.root, "dest.html")
+        self._write(previous, "same start, old end")
+        for text in ("same start, new end", "same start", "same start, old end and more"):
+            output = self._output(dest, text, previous)
+            self.assertFalse(output.close())
+            self.assertFalse(os.path.samefile(previous, dest))
+            self.assertEqual(self._read(dest), text)
+            self.assertFalse(os.path.exists(dest + ".tmp"))
+
+    def test_output_file_replaces_existing_destination(self):
+        dest = os.path.join(self.root, "dest.html")
+        self._write(dest, "old")
+        output = self._output(dest, "new", os.path.join(self.root, "missing"))
+        self.assertFalse(output.close())
+        self.assertEqual(self._read(dest), "new")
+
+    def test_output_file_skips_identical_destination(self):
+        dest = os.path.join(self.root, "dest.html")
+        self._write(dest, "same")
+        os.utime(dest, ns=(0, 0))
+        output = self._output(dest, "same")
+        self.assertFalse(os.path.exists(dest + ".tmp"))
+        self.assertTrue(output.close())
+        self.assertEqual(os.stat(dest).st_mtime_ns, 0)
+
+    def test_output_file_discarded_on_error(self):
+        dest = os.path.join(self.root, "dest.html")
+        self._write(dest, "old")
+        with self.assertRaises(RuntimeError):
+            with OutputFile(dest) as output:
+                output.write("new")
+                raise RuntimeError("render failed")
+        self.assertEqual(self._read(dest), "old")
+        self.assertFalse(os.path.exists(dest + ".tmp"))
+
+    def test_copy_or_link_skips_identical_destination(self):
+        source = os.path.join(self.root, "src.css")
+        dest = os.path.join(self.root, "dest.css")
+        self._write(source, "a {}")
+        self._write(dest, "a {}")
+        os.utime(dest, ns=(0, 0))
+        self.assertTrue(copy_or_link(source, dest, checksum=True))
+        self.assertEqual(os.stat(dest).st_mtime_ns, 0)
+        self._write(source, "b {}")
+        self.assertFalse(copy_or_link(source, dest, checksum=True))
+        self.assertEqual(self._read(dest), "b {}")
+
+    def test_copy_or_link_quick_check_uses_size_and_mtime(self):
+        source = os.path.join(self.root, "src.css")
+        dest = os.path.join(self.root, "dest.css")
+        self._write(source, "a {}")
+        # A real copy, since the test edits dest in place below
+        self.assertFalse(copy_or_link(source, dest, strategy="copy"))
+        # The copy keeps the source mtime, so the next run skips it
+        self.assertEqual(os.stat(dest).st_mtime_ns, os.stat(source).st_mtime_ns)
+        self.assertTrue(copy_or_link(source, dest))
+        # Same size and mtime counts as unchanged unless checksum is requested
+        self._write(dest, "b {}")
+        os.utime(dest, ns=(os.stat(source).st_atime_ns, os.stat(source).st_mtime_ns))
+        self.assertTrue(copy_or_link(source, dest))
+        self.assertFalse(copy_or_link(source, dest, checksum=True, strategy="copy"))
+        self.assertEqual(self._read(dest), "a {}")
+
+    def test_output_stats_count_writes_and_skips(self):
+        take_output_stats()
+        source = os.path.join(self.root, "src.css")
+        self._write(source, "a {}")
+        copy_or_link(source, os.path.join(self.root, "one.css"))
+        copy_or_link(source, os.path.join(self.root, "one.css"))
+        stats = take_output_stats()
+        self.assertEqual((stats.written, stats.skipped), (1, 1))
+        self.assertEqual(staging.output_stats.written, 0)
+
+    def test_copy_or_link(self):
+        source = os.path.join(self.root, "src.css")
+        previous = os.path.join(self.root, "prev.css")
+        self._write(source, "a {}")
+        self._write(previous, "a {}")
+        self.assertTrue(copy_or_link(source, os.path.join(self.root, "one.css"), previous,
+                                     checksum=True))
+        self._write(previous, "b {}")
+        self.assertFalse(copy_or_link(source, os.path.join(self.root, "two.css"), previous,
+                                      checksum=True))
+        self.assertEqual(self._read(os.path.join(self.root, "two.css")), "a {}")
+
+
+if __name__ == "__main__":
+    unittest.main()
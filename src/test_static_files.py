@@ -0,0 +1,114 @@
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+from fixtures import TempDirMixin
+import report
+from staging import copy_or_link
+from static_files import StaticCopyError, copy_static_to_public
+
+
+class TestCopyStaticToPublic(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "docs")
+        self._write(os.path.join(self.source, "index.css"), "body {}")
+        self._write(os.path.join(self.source, "images", "a.png"), "png")
+
+    def _copy(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            copy_static_to_public(self.source, self.dest, **kwargs)
+
+    def _files(self):
+        found = []
+        for dir_path, _, filenames in os.walk(self.dest):
+            for filename in filenames:
+                found.append(os.path.relpath(os.path.join(dir_path, filename), self.dest))
+        return sorted(found)
+
+    def test_copy_replaces_destination(self):
+        self._write(os.path.join(self.dest, "old.txt"), "old")
+        self._copy()
+        self.assertEqual(self._files(), ["images/a.png", "index.css"])
+
+    def test_sync_copies_only_changed_files(self):
+        # A real copy, so rewriting the source cannot change dest by itself
+        self._copy(sync=True, strategy="copy")
+        css = os.path.join(self.dest, "index.css")
+        inode = os.stat(css).st_ino
+        self._write(os.path.join(self.source, "images", "a.png"), "new png")
+        self._copy(sync=True, strategy="copy")
+        self.assertEqual(os.stat(css).st_ino, inode)
+        self.assertEqual(self._read(os.path.join(self.dest, "images", "a.png")), "new png")
+
+    def test_sync_removes_stale_files_but_keeps_protected(self):
+        self._copy(sync=True)
+        self._write(os.path.join(self.dest, "index.html"), "page")
+        self._write(os.path.join(self.dest, "blog", "post.html"), "page")
+        self._write(os.path.join(self.dest, "old", "stale.css"), "stale")
+        os.remove(os.path.join(self.source, "images", "a.png"))
+        os.rmdir(os.path.join(self.source, "images"))
+        self._copy(sync=True, protect=["index.html", "blog/post.html"])
+        self.assertEqual(self._files(), ["blog/post.html", "index.css", "index.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+
+    def test_sync_replaces_file_with_directory(self):
+        self._write(os.path.join(self.dest, "images"), "not a dir")
+        self._copy(sync=True)
+        self.assertEqual(self._files(), ["images/a.png", "index.css"])
+
+    def test_parallel_copy_matches_serial_copy(self):
+        for i in range(20):
+            self._write(os.path.join(self.source, "deep", str(i % 3), f"{i}.txt"), str(i))
+        self._copy()
+        serial = self._files()
+        self._copy(jobs=4)
+        self.assertEqual(self._files(), serial)
+        self.assertEqual(self._read(os.path.join(self.dest, "deep", "1", "7.txt")), "7")
+
+    def test_parallel_copy_reports_in_walk_order(self):
+        report.configure(report.VERBOSE)
+        self.addCleanup(report.configure, report.NORMAL)
+        for name in "abcdef":
+            self._write(os.path.join(self.source, "docs", f"{name}.txt"), name)
+
+        def copied_files(**kwargs):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                copy_static_to_public(self.source, self.dest, strategy="copy", **kwargs)
+            return [line for line in output.getvalue().splitlines()
+                    if line.startswith("Copying file")]
+
+        serial = copied_files()
+        self.assertEqual(len(serial), 8)
+        self.assertEqual(copied_files(jobs=4), serial)
+
+    def test_parallel_sync_copies_changed_files(self):
+        self._copy(sync=True, jobs=4, strategy="copy")
+        self._write(os.path.join(self.source, "images", "a.png"), "new png")
+        self._copy(sync=True, jobs=4, strategy="copy")
+        self.assertEqual(self._files(), ["images/a.png", "index.css"])
+        self.assertEqual(self._read(os.path.join(self.dest, "images", "a.png")), "new png")
+
+    def test_parallel_copy_raises_all_failures(self):
+        for name in ("b.css", "c.css"):
+            self._write(os.path.join(self.source, name), name)
+
+        def failing_copy(source_path, dest_path, *args):
+            if source_path.endswith(("b.css", "c.css")):
+                raise OSError(f"cannot copy {source_path}")
+            return copy_or_link(source_path, dest_path, *args)
+
+        with mock.patch("static_files.copy_or_link", failing_copy):
+            with self.assertRaises(StaticCopyError) as cm:
+                self._copy(jobs=4)
+        self.assertEqual(sorted(os.path.basename(path) for path, _ in cm.exception.failures),
+                         ["b.css", "c.css"])
+        # The other files were still copied
+        self.assertEqual(self._files(), ["images/a.png", "index.css"])
+
+if __name__ == "__main__":
+    unittest.main()
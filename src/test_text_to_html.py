@@ -2,6 +2,7 @@ import unittest
 
 from textnode import TextNode, TextType
 from text_to_html import text_node_to_html_node
+from url_resolver import UrlResolver
 
 
 class TestTextToHTML(unittest.TestCase):
@@ -76,6 +77,16 @@ class TestTextToHTML(unittest.TestCase):
         html_node = text_node_to_html_node(node)
         self.assertEqual(html_node.to_html(), '<img src="sunset.jpg" alt="A beautiful sunset"></img>')
 
+    def test_link_url_resolved(self):
+        node = TextNode("Home", TextType.LINK, "/blog/tom")
+        html_node = text_node_to_html_node(node, UrlResolver("/bootsite/"))
+        self.assertEqual(html_node.props, {"href": "/bootsite/blog/tom"})
+
+    def test_image_url_resolved(self):
+        node = TextNode("Tom", TextType.IMAGE, "/images/tom.png")
+        html_node = text_node_to_html_node(node, UrlResolver("/bootsite/"))
+        self.assertEqual(html_node.props, {"src": "/bootsite/images/tom.png", "alt": "Tom"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+import contextlib
+import io
+import json
+import os
+import time
+import unittest
+
+from fixtures import TempDirMixin
+import timings
+from htmlnode import LeafNode, ParentNode
+from pagegen import collect_pages, generate_pages
+
+
+class TestTimings(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(timings.disable)
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        self._write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self._write(os.path.join(self.content, "a.md"), "# A\n\nSome **bold** text")
+        self._write(os.path.join(self.content, "b.md"), "# B\n\n- one\n- two")
+
+    def _generate(self, jobs=1):
+        pages = collect_pages(self.content, os.path.join(self.root, "docs"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(pages, self.template, jobs=jobs)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(timings.collector())
+        self.assertIs(timings.current_page(), timings.NULL_PAGE_TIMINGS)
+        self._generate()
+        self.assertIsNone(timings.collector())
+
+    def test_records_stages_and_counters(self):
+        build_timings = timings.enable()
+        self._generate()
+        self.assertEqual([os.path.basename(page.path) for page in build_timings.pages],
+                         ["a.md", "b.md"])
+        page = build_timings.pages[0]
+        self.assertGreater(page.total, 0)
+        self.assertGreater(page.stages["inline_parse"], 0)
+        self.assertEqual(page.blocks, 2)
+        self.assertEqual(page.input_bytes, len("# A\n\nSome **bold** text"))
+        self.assertGreater(page.output_bytes, 0)
+        self.assertEqual(build_timings.counters()["pages"], 2)
+
+    def test_streaming_stages_do_not_overlap(self):
+        build_timings = timings.enable()
+        self._generate()
+        for page in build_timings.pages:
+            for name in ("read", "block_split", "to_html", "template_fill", "write"):
+                self.assertGreater(page.stages[name], 0, name)
+            self.assertLessEqual(sum(page.stages.values()), page.total)
+            self.assertGreater(page.nodes, page.blocks)
+
+    def test_nested_stage_is_counted_once(self):
+        page = timings.PageTimings("a.md")
+        with page.stage("to_html"):
+            with page.stage("write"):
+                time.sleep(0.02)
+        self.assertGreaterEqual(page.stages["write"], 0.02)
+        self.assertLess(page.stages["to_html"], 0.02)
+        self.assertEqual(list(page.iter_stage("read", "ab")), ["a", "b"])
+
+    def test_collects_timings_from_worker_processes(self):
+        build_timings = timings.enable()
+        self._generate(jobs=2)
+        self.assertEqual(len(build_timings.pages), 2)
+
+    def test_report_and_json(self):
+        build_timings = timings.enable()
+        self._generate()
+        report = build_timings.report(top=1)
+        for name in timings.STAGES:
+            self.assertIn(name, report)
+        self.assertIn("Slowest 1 page(s)", report)
+
+        json_path = os.path.join(self.root, "timings.json")
+        build_timings.write_json(json_path)
+        with open(json_path) as f:
+            data = json.load(f)
+        self.assertEqual(data["counters"]["pages"], 2)
+        self.assertEqual(len(data["pages"]), 2)
+
+    def test_count_nodes(self):
+        tree = ParentNode("div", [ParentNode("p", [LeafNode(None, "a"), LeafNode("b", "c")])])
+        self.assertEqual(timings.count_nodes(tree), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
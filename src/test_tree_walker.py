@@ -0,0 +1,70 @@
+import os
+import unittest
+
+from fixtures import TempDirMixin
+from tree_walker import IGNORED_PATTERNS, walk_tree
+
+
+class TestWalkTree(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        for rel_path in ("index.md", "b.css", "blog/post.md", "blog/a/deep.md",
+                         ".hidden", "blog/.post.md.swp", "notes.md~", ".git/config",
+                         "page.tmp"):
+            self._write(os.path.join(self.root, *rel_path.split("/")), rel_path)
+
+    def _walk(self, **kwargs):
+        return [(rel_path, entry.is_dir()) for rel_path, entry in walk_tree(self.root, **kwargs)]
+
+    def test_sorted_with_directories_before_contents(self):
+        self.assertEqual(self._walk(), [
+            ("b.css", False),
+            ("blog", True),
+            ("index.md", False),
+            ("blog/a", True),
+            ("blog/post.md", False),
+            ("blog/a/deep.md", False),
+        ])
+
+    def test_include_filters_files_only(self):
+        self.assertEqual([rel_path for rel_path, is_dir in self._walk(include=("*.md",))
+                          if not is_dir],
+                         ["index.md", "blog/post.md", "blog/a/deep.md"])
+
+    def test_exclude_prunes_directories(self):
+        self.assertEqual(self._walk(exclude=IGNORED_PATTERNS + ("blog",)),
+                         [("b.css", False), ("index.md", False)])
+        self.assertNotIn("blog/a/deep.md",
+                         [rel_path for rel_path, _ in self._walk(exclude=("blog/a",))])
+
+    def test_nothing_excluded(self):
+        self.assertIn(".git/config", [rel_path for rel_path, _ in self._walk(exclude=())])
+
+    def test_entries_carry_paths(self):
+        entries = dict(walk_tree(self.root))
+        self.assertEqual(entries["blog/post.md"].path,
+                         os.path.join(self.root, "blog", "post.md"))
+
+    def test_missing_root(self):
+        self.assertEqual(list(walk_tree(os.path.join(self.root, "missing"))), [])
+
+    def test_deeper_than_recursion_limit(self):
+        path = self.root
+        for _ in range(1200):
+            path = os.path.join(path, "d")
+            os.mkdir(path)
+        with open(os.path.join(path, "leaf.md"), "w") as f:
+            f.write("leaf")
+        try:
+            files = [rel_path for rel_path, entry in walk_tree(self.root) if not entry.is_dir()]
+            self.assertIn("d/" * 1200 + "leaf.md", files)
+        finally:
+            # shutil.rmtree recurses too, so take the chain apart by hand
+            os.remove(os.path.join(path, "leaf.md"))
+            while path != self.root:
+                os.rmdir(path)
+                path = os.path.dirname(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from url_resolver import UrlResolver
+
+
+class TestUrlResolver(unittest.TestCase):
+    def test_resolve_with_basepath(self):
+        urls = UrlResolver("/bootsite/")
+        self.assertEqual(urls.resolve("/images/a.png"), "/bootsite/images/a.png")
+        self.assertEqual(urls.resolve("/"), "/bootsite/")
+
+    def test_resolve_leaves_other_urls_alone(self):
+        urls = UrlResolver("/bootsite/")
+        self.assertEqual(urls.resolve("https://boot.dev"), "https://boot.dev")
+        self.assertEqual(urls.resolve("relative/page"), "relative/page")
+        self.assertEqual(urls.resolve("#anchor"), "#anchor")
+
+    def test_default_basepath_is_identity(self):
+        self.assertEqual(UrlResolver().resolve("/index.css"), "/index.css")
+
+    def test_resolve_html(self):
+        urls = UrlResolver("/site/")
+        html = '<link href="/index.css" /><img src="/a.png" alt="/x" /><a href="https://x.y">'
+        self.assertEqual(
+            urls.resolve_html(html),
+            '<link href="/site/index.css" /><img src="/site/a.png" alt="/x" /><a href="https://x.y">',
+        )
+
+    def test_resolve_fingerprinted_assets(self):
+        urls = UrlResolver("/site/", {"index.css": "index.0123456789.css"})
+        self.assertEqual(urls.resolve("/index.css"), "/site/index.0123456789.css")
+        self.assertEqual(urls.resolve("/index.css?v=1#top"), "/site/index.0123456789.css?v=1#top")
+        self.assertEqual(urls.resolve("/other.css"), "/site/other.css")
+        self.assertEqual(urls.resolve("index.css"), "index.css")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from fixtures import TempDirMixin
+from watch import ReloadNotifier, SiteWatcher, diff_snapshots, snapshot_tree
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_snapshot_tree_suffix(self):
+        with tempfile.TemporaryDirectory() as root:
+            for name in ("a.md", "b.txt"):
+                with open(os.path.join(root, name), "w") as f:
+                    f.write(name)
+            self.assertEqual(list(snapshot_tree(root, suffix=".md")), ["a.md"])
+
+    def test_diff_snapshots(self):
+        old = {"a.md": (1, 1), "b.md": (1, 1)}
+        new = {"a.md": (2, 1), "c.md": (1, 1)}
+        self.assertEqual(diff_snapshots(old, new), (["a.md", "c.md"], ["b.md"]))
+
+
+class TestReloadNotifier(unittest.TestCase):
+    def test_wait_times_out_without_rebuild(self):
+        notifier = ReloadNotifier()
+        self.assertEqual(notifier.wait(0, timeout=0.01), 0)
+
+    def test_wait_returns_new_generation(self):
+        notifier = ReloadNotifier()
+        notifier.notify()
+        self.assertEqual(notifier.wait(0, timeout=0.01), 1)
+
+
+class TestSiteWatcher(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.docs = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self._write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self._write(os.path.join(self.content, "index.md"), "# Home")
+        self._write(os.path.join(self.static, "site.css"), "a {}")
+        self.watcher = SiteWatcher(self.content, self.static, self.template, self.docs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.watcher.initial_build()
+
+    def _write(self, path, text):
+        super()._write(path, text)
+        # Make sure the change is visible even on coarse mtime filesystems
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def _read_output(self, rel_path):
+        return self._read(os.path.join(self.docs, rel_path))
+
+    def _poll(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.watcher.poll()
+
+    def test_poll_without_changes(self):
+        self.assertFalse(self._poll())
+
+    def test_poll_rebuilds_changed_page(self):
+        self._write(os.path.join(self.content, "index.md"), "# Changed")
+        self.assertTrue(self._poll())
+        self.assertIn("<title>Changed</title>", self._read_output("index.html"))
+
+    def test_poll_adds_and_removes_outputs(self):
+        self._write(os.path.join(self.content, "blog", "post.md"), "# Post")
+        os.remove(os.path.join(self.static, "site.css"))
+        self.assertTrue(self._poll())
+        self.assertIn("<title>Post</title>", self._read_output("blog/post.html"))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "site.css")))
+
+    def test_template_change_rebuilds_all_pages(self):
+        self._write(self.template, "<main>{{ Title }}</main>")
+        self.assertTrue(self._poll())
+        self.assertEqual(self._read_output("index.html"), "<main>Home</main>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,17 @@ from textnode import TextNode, TextType
 from htmlnode import LeafNode
 
 
-def text_node_to_html_node(text_node):
+def text_node_to_html_node(text_node, urls=None):
+    """
+    Convert a TextNode to a LeafNode.
+
+    Args:
+        text_node: TextNode to convert
+        urls: Optional UrlResolver applied to link and image URLs
+
+    Returns:
+        LeafNode representing the inline element
+    """
     if text_node.text_type == TextType.TEXT:
         return LeafNode(None, text_node.text)
     elif text_node.text_type == TextType.BOLD:
@@ -12,8 +22,10 @@ def text_node_to_html_node(text_node):
     elif text_node.text_type == TextType.CODE:
         return LeafNode("code", text_node.text)
     elif text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
+        url = text_node.url if urls is None else urls.resolve(text_node.url)
+        return LeafNode("a", text_node.text, {"href": url})
     elif text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+        url = text_node.url if urls is None else urls.resolve(text_node.url)
+        return LeafNode("img", "", {"src": url, "alt": text_node.text})
     else:
         raise ValueError(f"Invalid text type: {text_node.text_type}")
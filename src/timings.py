@@ -0,0 +1,231 @@
+import contextlib
+import json
+import time
+
+
+# Stages of generating one page, in pipeline order. Blocks are classified
+# in the same pass that splits them out (markdown_blocks.parse_block), so
+# "block_split" includes block classification
+STAGES = (
+    "read",
+    "block_split",
+    "inline_parse",
+    "to_html",
+    "template_fill",
+    "write",
+)
+
+
+class PageTimings:
+    """
+    Time spent in each stage of generating one page, plus size counters.
+
+    Stages may nest, as they do when a page is streamed: reading the
+    markdown happens while its blocks are split, which happens while the
+    HTML is written. Time spent in an inner stage is only counted there,
+    not in the stages around it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.total = 0.0
+        self.blocks = 0
+        self.nodes = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        # Innermost running stage and when its time was last counted
+        self._running = None
+        self._since = 0.0
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        now = time.perf_counter()
+        outer = self._running
+        if outer is not None:
+            self.stages[outer] += now - self._since
+        self._running, self._since = name, now
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.stages[name] += now - self._since
+            self._running, self._since = outer, now
+
+    def iter_stage(self, name, iterable):
+        """Yield the items of iterable, counting the time spent producing each toward a stage."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                item = next(iterator, _END)
+            if item is _END:
+                return
+            yield item
+
+    def to_dict(self):
+        return {
+            "path": self.path,
+            "total": self.total,
+            "stages": dict(self.stages),
+            "blocks": self.blocks,
+            "nodes": self.nodes,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+        }
+
+
+class _NullPageTimings:
+    """Stand-in used while timings are off, so call sites need no branches."""
+
+    _null_stage = contextlib.nullcontext()
+
+    def stage(self, name):
+        return self._null_stage
+
+    def iter_stage(self, name, iterable):
+        return iterable
+
+
+NULL_PAGE_TIMINGS = _NullPageTimings()
+
+# Marks the end of an iterator in PageTimings.iter_stage
+_END = object()
+
+
+class BuildTimings:
+    """Per-page timings collected over a whole build."""
+
+    def __init__(self):
+        self.pages = []
+
+    def take_pages(self):
+        """Remove and return the pages recorded so far (used by worker processes)."""
+        pages, self.pages = self.pages, []
+        return pages
+
+    def stage_totals(self):
+        totals = dict.fromkeys(STAGES, 0.0)
+        for page in self.pages:
+            for name, seconds in page.stages.items():
+                totals[name] += seconds
+        return totals
+
+    def counters(self):
+        return {
+            "pages": len(self.pages),
+            "blocks": sum(page.blocks for page in self.pages),
+            "nodes": sum(page.nodes for page in self.pages),
+            "input_bytes": sum(page.input_bytes for page in self.pages),
+            "output_bytes": sum(page.output_bytes for page in self.pages),
+        }
+
+    def slowest(self, top=10):
+        return sorted(self.pages, key=lambda page: page.total, reverse=True)[:top]
+
+    def report(self, top=10):
+        """
+        Format the collected timings as a text report.
+
+        Args:
+            top: Number of slowest pages to list
+
+        Returns:
+            Multi-line report string
+        """
+        totals = self.stage_totals()
+        grand_total = sum(page.total for page in self.pages)
+        page_count = max(len(self.pages), 1)
+
+        lines = ["Build timings (block_split includes block classification)",
+                 f"{'stage':<15}{'total ms':>12}{'share':>9}{'ms/page':>11}"]
+        for name in STAGES:
+            seconds = totals[name]
+            share = seconds / grand_total * 100 if grand_total else 0.0
+            lines.append(f"{name:<15}{seconds * 1000:>12.2f}{share:>8.1f}%"
+                         f"{seconds * 1000 / page_count:>11.3f}")
+        other = grand_total - sum(totals.values())
+        lines.append(f"{'other':<15}{other * 1000:>12.2f}")
+        lines.append(f"{'total':<15}{grand_total * 1000:>12.2f}")
+
+        lines.append("")
+        lines.append(f"Slowest {min(top, len(self.pages))} page(s)")
+        for page in self.slowest(top):
+            lines.append(f"{page.total * 1000:>10.2f} ms  {page.input_bytes:>10} B in"
+                         f"  {page.output_bytes:>10} B out  {page.path}")
+
+        lines.append("")
+        lines.append("Counters")
+        for name, value in self.counters().items():
+            lines.append(f"{name:<15}{value:>12}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "stages": self.stage_totals(),
+            "counters": self.counters(),
+            "pages": [page.to_dict() for page in self.pages],
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def count_nodes(node):
+    """Count the HTML nodes in a tree."""
+    count = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        count += 1
+        if current.children:
+            stack.extend(current.children)
+    return count
+
+
+# Collector for the running build while timings are enabled
+_collector = None
+# Timings of the page currently being generated in this process
+_current_page = None
+
+
+def enable():
+    """Start collecting timings in this process and return the collector."""
+    global _collector
+    _collector = BuildTimings()
+    return _collector
+
+
+def disable():
+    global _collector, _current_page
+    _collector = None
+    _current_page = None
+
+
+def collector():
+    """Return the active BuildTimings, or None when timings are off."""
+    return _collector
+
+
+def begin_page(path):
+    """Start timing a page; returns None when timings are off."""
+    global _current_page
+    if _collector is None:
+        return None
+    _current_page = PageTimings(path)
+    return _current_page
+
+
+def end_page(page):
+    """Finish timing a page started with begin_page."""
+    global _current_page
+    _current_page = None
+    if page is not None and _collector is not None:
+        _collector.pages.append(page)
+
+
+def current_page():
+    """Timings of the page being generated, or a no-op stand-in when timings are off."""
+    if _current_page is None:
+        return NULL_PAGE_TIMINGS
+    return _current_page
@@ -0,0 +1,70 @@
+import os
+from fnmatch import fnmatch
+
+
+# Hidden files and the leftovers of editors and interrupted writes
+IGNORED_PATTERNS = (
+    ".*",
+    "*~",
+    "#*#",
+    "*.swp",
+    "*.swo",
+    "*.swx",
+    "*.tmp",
+)
+
+
+def walk_tree(root_dir, include=None, exclude=IGNORED_PATTERNS):
+    """
+    Enumerate the files and directories below root_dir in one pass.
+
+    The walk uses os.scandir and an explicit stack instead of recursion, so
+    the type of each entry comes from the directory listing (no extra stat
+    on most filesystems) and deep trees cannot exhaust the recursion limit.
+    Entries are yielded sorted by name within a directory, and every
+    directory is yielded before anything inside it. Entries that are
+    neither files nor directories, such as dangling symlinks, are skipped.
+
+    Args:
+        root_dir: Directory to walk; a missing directory yields nothing
+        include: Optional glob patterns; files whose name or relative path
+            matches none of them are skipped (directories are always walked)
+        exclude: Glob patterns of names or relative paths to skip; an
+            excluded directory is skipped with everything inside it
+
+    Yields:
+        (rel_path, entry) tuples, where rel_path is relative to root_dir
+        with "/" separators and entry is the os.DirEntry; entry.stat()
+        results are cached by the entry
+    """
+    if not os.path.isdir(root_dir):
+        return
+
+    stack = [(root_dir, "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except FileNotFoundError:
+            # Removed while we were walking, as os.walk would skip it
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = rel_dir + entry.name
+            if exclude and _matches(entry.name, rel_path, exclude):
+                continue
+            if entry.is_dir():
+                yield rel_path, entry
+                subdirs.append((entry.path, rel_path + "/"))
+            elif entry.is_file():
+                if include is None or _matches(entry.name, rel_path, include):
+                    yield rel_path, entry
+
+        # Reversed, so subdirectories are popped in name order
+        stack.extend(reversed(subdirs))
+
+
+def _matches(name, rel_path, patterns):
+    return any(fnmatch(name, pattern) or fnmatch(rel_path, pattern) for pattern in patterns)
@@ -0,0 +1,59 @@
+import re
+
+
+# href/src attributes in raw HTML such as the page template
+URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src)="([^"]*)"')
+
+# Start of the query string or fragment of a URL
+URL_SUFFIX_PATTERN = re.compile(r"[?#]")
+
+
+class UrlResolver:
+    """
+    Resolve site-absolute URLs against the basepath the site is served from.
+
+    Links and images are resolved once, when their nodes are created,
+    instead of rewriting the finished HTML. With an asset map, URLs of
+    fingerprinted static assets are also replaced by their fingerprinted
+    names.
+    """
+
+    def __init__(self, basepath="/", assets=None):
+        self.basepath = basepath
+        self.assets = assets
+
+    def resolve(self, url):
+        """
+        Resolve a URL from the markdown or template.
+
+        Args:
+            url: URL as written by the author
+
+        Returns:
+            The URL with a leading "/" replaced by the basepath and a
+            fingerprinted asset name substituted; other URLs are returned
+            unchanged
+        """
+        if not url.startswith("/"):
+            return url
+        if self.assets:
+            url = self._fingerprint(url)
+        if self.basepath != "/":
+            return self.basepath + url[1:]
+        return url
+
+    def resolve_html(self, html):
+        """Resolve the URL of every href/src attribute in a piece of raw HTML."""
+        return URL_ATTRIBUTE_PATTERN.sub(
+            lambda match: f'{match.group(1)}="{self.resolve(match.group(2))}"', html)
+
+    def _fingerprint(self, url):
+        match = URL_SUFFIX_PATTERN.search(url)
+        end = match.start() if match else len(url)
+        fingerprinted = self.assets.get(url[1:end])
+        if fingerprinted is None:
+            return url
+        return "/" + fingerprinted + url[end:]
+
+    def __repr__(self):
+        return f"UrlResolver({self.basepath})"
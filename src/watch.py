@@ -0,0 +1,290 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from build import build_site, remove_output
+from manifest import hash_file, save_manifest
+from page_template import PageTemplate
+from pagegen import generate_page, page_dest_path
+import report
+from staging import copy_or_link
+from tree_walker import walk_tree
+from url_resolver import UrlResolver
+
+
+RELOAD_ENDPOINT = "/__livereload"
+
+# Injected into served HTML pages (never into the files on disk)
+RELOAD_SCRIPT = (
+    f'<script>new EventSource("{RELOAD_ENDPOINT}").onmessage = '
+    '() => location.reload();</script>'
+)
+
+
+def snapshot_tree(root_dir, suffix=None):
+    """
+    Record the modification time and size of every file below a directory.
+
+    Files walk_tree ignores, such as editor swap files, are left out, so
+    saving in an editor does not trigger a rebuild of its temp files.
+
+    Args:
+        root_dir: Directory to walk
+        suffix: Optional file suffix (e.g. ".md") to restrict the walk to
+
+    Returns:
+        Dict mapping paths relative to root_dir (with "/" separators) to
+        (mtime_ns, size) tuples
+    """
+    snapshot = {}
+    include = (f"*{suffix}",) if suffix is not None else None
+    for rel_path, entry in walk_tree(root_dir, include=include):
+        if entry.is_dir():
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            # Deleted between listing and stat; the next poll picks it up
+            continue
+        snapshot[rel_path] = (stat.st_mtime_ns, stat.st_size)
+
+    return snapshot
+
+
+def diff_snapshots(old, new):
+    """
+    Compare two snapshots taken by snapshot_tree.
+
+    Returns:
+        Tuple (changed, removed) of sorted relative paths; changed covers
+        both new and modified files
+    """
+    changed = sorted(path for path, stat in new.items() if old.get(path) != stat)
+    removed = sorted(path for path in old if path not in new)
+    return changed, removed
+
+
+class ReloadNotifier:
+    """Lets browser connections wait for the next finished rebuild."""
+
+    def __init__(self):
+        self.generation = 0
+        self._condition = threading.Condition()
+
+    def notify(self):
+        with self._condition:
+            self.generation += 1
+            self._condition.notify_all()
+
+    def wait(self, generation, timeout):
+        """Block until a rebuild newer than generation finished or timeout expires."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class SiteWatcher:
+    """
+    Poll the site sources and rebuild only what changed.
+
+    The compiled template and the imported parser modules stay loaded for
+    the lifetime of the watcher, so a rebuild only pays for the pages and
+    assets that actually changed.
+    """
+
+    def __init__(self, content_dir, static_dir, template_path, dest_dir, basepath="/"):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.manifest = None
+        self.template = None
+        self.snapshots = None
+
+    def initial_build(self):
+        """Bring the output up to date with an incremental build."""
+        self.snapshots = self._take_snapshots()
+        self.manifest = build_site(self.content_dir, self.static_dir, self.template_path,
+                                   self.dest_dir, self.basepath, incremental=True)
+        self._compile_template()
+
+    def poll(self):
+        """
+        Check the sources once and rebuild whatever changed.
+
+        Returns:
+            True if anything was rebuilt or removed
+        """
+        snapshots = self._take_snapshots()
+        if snapshots == self.snapshots:
+            return False
+
+        template_changed = snapshots["template"] != self.snapshots["template"]
+        page_changes = diff_snapshots(self.snapshots["pages"], snapshots["pages"])
+        static_changes = diff_snapshots(self.snapshots["static"], snapshots["static"])
+        self.snapshots = snapshots
+
+        if template_changed and snapshots["template"]:
+            self._compile_template()
+            self.manifest["template"] = hash_file(self.template_path)
+            # Every page depends on the template
+            page_changes = (sorted(snapshots["pages"]), page_changes[1])
+
+        self._rebuild_pages(*page_changes)
+        self._rebuild_static(*static_changes)
+        save_manifest(self.dest_dir, self.manifest)
+        return True
+
+    def _compile_template(self):
+        self.template = PageTemplate.from_file(self.template_path, UrlResolver(self.basepath))
+
+    def _take_snapshots(self):
+        try:
+            template_stat = os.stat(self.template_path)
+            template = (template_stat.st_mtime_ns, template_stat.st_size)
+        except FileNotFoundError:
+            template = None
+        return {
+            "template": template,
+            "pages": snapshot_tree(self.content_dir, suffix='.md'),
+            "static": snapshot_tree(self.static_dir),
+        }
+
+    def _rebuild_pages(self, changed, removed):
+        for rel_path in removed:
+            remove_output(self.dest_dir, page_dest_path(rel_path))
+            self.manifest["pages"].pop(rel_path, None)
+
+        for rel_path in changed:
+            from_path = os.path.join(self.content_dir, rel_path)
+            dest_path = os.path.join(self.dest_dir, page_dest_path(rel_path))
+            try:
+                generate_page(from_path, self.template_path, dest_path, self.basepath,
+                              self.template)
+            except Exception as e:
+                # Keep watching; the writer will fix the page and save again
+                report.warning(f"Error generating {from_path}: {e}")
+                continue
+            self.manifest["pages"][rel_path] = hash_file(from_path)
+
+    def _rebuild_static(self, changed, removed):
+        for rel_path in removed:
+            remove_output(self.dest_dir, rel_path)
+
+        for rel_path in changed:
+            source_path = os.path.join(self.static_dir, rel_path)
+            dest_path = os.path.join(self.dest_dir, rel_path)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            if not copy_or_link(source_path, dest_path):
+                report.detail(f"Copying file: {source_path} -> {dest_path}")
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """Serve the output directory and push reload events to open pages."""
+
+    def __init__(self, *args, notifier, **kwargs):
+        self.notifier = notifier
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url_path = self.path.split('?', 1)[0]
+        if url_path == RELOAD_ENDPOINT:
+            self._stream_reload_events()
+            return
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and url_path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if path.endswith('.html') and os.path.isfile(path):
+            self._send_html_with_reload_script(path)
+            return
+
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        # Request logs would drown out the rebuild messages
+        pass
+
+    def _send_html_with_reload_script(self, path):
+        with open(path, 'rb') as f:
+            body = f.read()
+        script = RELOAD_SCRIPT.encode('utf-8')
+        index = body.rfind(b'</body>')
+        if index == -1:
+            body += script
+        else:
+            body = body[:index] + script + body[index:]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_reload_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+        generation = self.notifier.generation
+        try:
+            while True:
+                new_generation = self.notifier.wait(generation, timeout=15)
+                if new_generation != generation:
+                    self.wfile.write(b"data: reload\n\n")
+                    generation = new_generation
+                else:
+                    # Comment line that keeps idle connections open
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve_and_watch(content_dir, static_dir, template_path, dest_dir, basepath="/",
+                    port=8888, interval=0.2):
+    """
+    Build the site, serve it on localhost and rebuild it as sources change.
+
+    Open pages reload themselves once a rebuild they are affected by has
+    been written. Runs until interrupted with Ctrl+C.
+
+    Args:
+        content_dir: Directory containing the markdown content
+        static_dir: Directory containing the static assets
+        template_path: Path to the HTML template
+        dest_dir: Output directory to serve
+        basepath: URL prefix the site is served from
+        port: Local port for the HTTP server
+        interval: Seconds between two polls of the sources
+    """
+    watcher = SiteWatcher(content_dir, static_dir, template_path, dest_dir, basepath)
+    watcher.initial_build()
+    report.finish()
+
+    notifier = ReloadNotifier()
+    handler = functools.partial(LiveReloadHandler, directory=dest_dir, notifier=notifier)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    report.info(f"Serving {dest_dir} at http://127.0.0.1:{port}/ (watching for changes, Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            started = time.perf_counter()
+            if watcher.poll():
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                report.info(f"Rebuilt in {elapsed_ms:.0f} ms")
+                report.finish()
+                notifier.notify()
+    except KeyboardInterrupt:
+        report.info("Stopping watch mode")
+    finally:
+        server.shutdown()
+        server.server_close()